@@ -2,10 +2,12 @@
 配置管理 API 路由
 用于保存和加载前端配置（indicators.config.json）
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from pydantic import BaseModel
 from typing import Dict, Any
 import json
+import os
+import orjson
 from pathlib import Path
 
 # 创建路由器
@@ -58,9 +60,15 @@ async def save_indicator_config(config: IndicatorConfigRequest):
         # 确保目录存在
         CONFIG_FILE_PATH.parent.mkdir(parents=True, exist_ok=True)
 
-        # 将配置写入文件（格式化输出）
-        with open(CONFIG_FILE_PATH, 'w', encoding='utf-8') as f:
-            json.dump(config.dict(), f, indent=2, ensure_ascii=False)
+        # orjson 序列化为 bytes（格式化输出）, 先写临时文件再原子替换,
+        # 避免进程中途崩溃留下损坏的配置文件
+        data = orjson.dumps(
+            config.dict(),
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+        )
+        tmp_path = CONFIG_FILE_PATH.with_suffix('.tmp')
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, CONFIG_FILE_PATH)
 
         print(f"✅ 配置文件已保存: {CONFIG_FILE_PATH}")
 
@@ -78,10 +86,12 @@ async def save_indicator_config(config: IndicatorConfigRequest):
 
 
 @router.get("/indicators")
-async def get_indicator_config():
+async def get_indicator_config(request: Request, response: Response):
     """
     读取指标配置文件
 
+    带 ETag/Cache-Control 协商缓存: 文件未变化时返回 304, 避免重复读盘和序列化
+
     Returns:
         配置对象
     """
@@ -92,9 +102,19 @@ async def get_indicator_config():
                 detail="Configuration file not found"
             )
 
+        # ETag 由文件 mtime + 大小构成, 文件更新后自动失效
+        stat = CONFIG_FILE_PATH.stat()
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+
         with open(CONFIG_FILE_PATH, 'r', encoding='utf-8') as f:
             config = json.load(f)
 
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "public, max-age=30"
+
         return config
     except HTTPException:
         raise
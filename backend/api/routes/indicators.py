@@ -2,12 +2,14 @@
 指标配置 API 路由
 提供指标metadata给前端，用于自动生成设置面板
 """
-from fastapi import APIRouter, HTTPException
+import hashlib
+import json
+from fastapi import APIRouter, HTTPException, Request, Response
 from typing import List
 
 from backend.services.indicators import (
     IndicatorMetadata,
-    get_indicator_metadata,
+    get_indicator_metadata_json,
     get_all_indicators,
     get_indicators_by_category,
 )
@@ -19,9 +21,21 @@ router = APIRouter(
     responses={404: {"description": "Indicator not found"}},
 )
 
+# 指标 metadata 在进程内是常量, 启动时算一次 ETag 即可
+_METADATA_ETAG = '"' + hashlib.md5(
+    json.dumps(
+        [m.dict() for m in get_all_indicators()],
+        sort_keys=True,
+        default=str,
+    ).encode('utf-8')
+).hexdigest() + '"'
+
+# metadata 几乎不变, 允许客户端缓存 5 分钟
+_CACHE_CONTROL = "public, max-age=300"
+
 
 @router.get("/", response_model=List[IndicatorMetadata])
-async def list_indicators(category: str | None = None):
+async def list_indicators(request: Request, response: Response, category: str | None = None):
     """
     获取所有指标的配置Schema
 
@@ -60,13 +74,20 @@ async def list_indicators(category: str | None = None):
     ]
     ```
     """
+    # metadata 是进程常量, 命中 ETag 时直接 304, 省掉序列化和传输
+    if request.headers.get("if-none-match") == _METADATA_ETAG:
+        return Response(status_code=304, headers={"ETag": _METADATA_ETAG})
+
+    response.headers["ETag"] = _METADATA_ETAG
+    response.headers["Cache-Control"] = _CACHE_CONTROL
+
     if category:
         return get_indicators_by_category(category)
     return get_all_indicators()
 
 
 @router.get("/{indicator_id}", response_model=IndicatorMetadata)
-async def get_indicator(indicator_id: str):
+async def get_indicator(indicator_id: str, request: Request):
     """
     获取单个指标的配置Schema
 
@@ -79,10 +100,19 @@ async def get_indicator(indicator_id: str):
     Raises:
         404: 指标不存在
     """
-    metadata = get_indicator_metadata(indicator_id)
-    if not metadata:
+    # 元数据是进程常量, 序列化字节按指标 lru_cache 一次, 直接回发
+    body = get_indicator_metadata_json(indicator_id)
+    if body is None:
         raise HTTPException(
             status_code=404,
             detail=f"Indicator '{indicator_id}' not found"
         )
-    return metadata
+
+    if request.headers.get("if-none-match") == _METADATA_ETAG:
+        return Response(status_code=304, headers={"ETag": _METADATA_ETAG})
+
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": _METADATA_ETAG, "Cache-Control": _CACHE_CONTROL},
+    )
@@ -1,24 +1,23 @@
 """
 股票数据 API 路由 - 使用 APIRouter 模块化
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import Annotated
+import time
+from collections import OrderedDict
+from typing import Annotated, Iterator
+
+import numpy as np
 import pandas as pd
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from numba import njit
 
 from backend.core.dependencies import get_data_service, get_indicator_service
 from backend.services.data_service import DataService
 from backend.services.indicator_service import IndicatorService
 from backend.services.timeframe_service import TimeframeService, TimeframeType
 from backend.services.indicator_parser import IndicatorParser, IndicatorCalculator
-from backend.schemas.stock import (
-    StockDataResponse,
-    CandleData,
-    VolumeData,
-    ValueData,
-    MACDData,
-    KDJData,
-    BOLLData,
-)
+from backend.schemas.stock import StockDataResponse
+from backend.schemas.stock_encoder import iter_stock_response_fragments
 
 # 创建路由器
 router = APIRouter(
@@ -27,8 +26,44 @@ router = APIRouter(
     responses={404: {"description": "Stock not found"}},
 )
 
-
-@router.get("/{symbol}", response_model=StockDataResponse)
+# 路由级响应缓存: 查询参数组合 -> (写入时间, 编码好的响应字节)
+# 相同查询的重复图表加载直接返回缓存字节, 跳过 pandas/指标/编码全流程
+_RESPONSE_CACHE_MAX = 64
+_RESPONSE_CACHE_TTL = 60.0  # 秒
+_response_cache: OrderedDict[tuple, tuple[float, bytes]] = OrderedDict()
+
+
+def _cached_response_bytes(cache_key: tuple) -> bytes | None:
+    """查询响应缓存, 过期条目顺手清除"""
+    entry = _response_cache.get(cache_key)
+    if entry is None:
+        return None
+    stored_at, body = entry
+    if time.monotonic() - stored_at > _RESPONSE_CACHE_TTL:
+        del _response_cache[cache_key]
+        return None
+    _response_cache.move_to_end(cache_key)
+    return body
+
+
+def _stream_and_cache(cache_key: tuple, fragments: Iterator[bytes]) -> Iterator[bytes]:
+    """边流式输出边累积片段, 流结束后把完整字节写入缓存"""
+    chunks = []
+    for fragment in fragments:
+        chunks.append(fragment)
+        yield fragment
+    _response_cache[cache_key] = (time.monotonic(), b''.join(chunks))
+    if len(_response_cache) > _RESPONSE_CACHE_MAX:
+        _response_cache.popitem(last=False)
+
+
+# response_model=None 关闭 FastAPI 对响应的二次校验/序列化
+# (payload 已由 stock_encoder 编码好), OpenAPI 文档仍引用 StockDataResponse
+@router.get(
+    "/{symbol}",
+    response_model=None,
+    responses={200: {"model": StockDataResponse}},
+)
 async def get_stock_data(
     symbol: str,
     data_service: Annotated[DataService, Depends(get_data_service)],
@@ -48,15 +83,23 @@ async def get_stock_data(
     - **indicators**: 可选,动态指标配置 (格式: ma:5,20,60;kdj:9-3-3;macd:12-26-9;rsi:14;boll:20-2.0)
                      留空则返回所有默认指标
     """
+    # 响应缓存命中时直接返回编码好的字节
+    cache_key = (symbol, interval, start_date, end_date, indicators)
+    cached_body = _cached_response_bytes(cache_key)
+    if cached_body is not None:
+        return Response(content=cached_body, media_type="application/json")
+
     try:
         # 加载数据
         df = await data_service.load_stock_data(symbol)
 
         # 日期筛选（在聚合之前进行）
-        if start_date:
-            df = df[df['time'] >= start_date]
-        if end_date:
-            df = df[df['time'] <= end_date]
+        # 数据已按日期排序, 二分查找 O(log N) 定位边界后零拷贝切片
+        if start_date or end_date:
+            time_arr = df['time'].values
+            lo = np.searchsorted(time_arr, start_date, side='left') if start_date else 0
+            hi = np.searchsorted(time_arr, end_date, side='right') if end_date else len(df)
+            df = df.iloc[lo:hi]
 
         if df.empty:
             raise HTTPException(status_code=404, detail="No data found for the given date range")
@@ -78,10 +121,14 @@ async def get_stock_data(
             # 使用默认指标（保持向后兼容）
             df = indicator_service.add_all_indicators(df)
 
-        # 构建响应数据
-        response = _build_response(df, symbol)
+        # 构建响应数据 (纯 dict payload, 按顶层字段分块流式编码,
+        # 首个片段可以在其余字段仍在编码时就开始发送)
+        payload = _build_response(df, symbol)
 
-        return response
+        return StreamingResponse(
+            _stream_and_cache(cache_key, iter_stock_response_fragments(payload)),
+            media_type="application/json",
+        )
 
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -136,18 +183,55 @@ async def recalculate_indicators(
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@njit(cache=True)
+def _valid_value_indices(values: np.ndarray) -> np.ndarray:
+    """
+    JIT 压缩核: 单遍扫描返回有效值下标
+
+    把 `(values != 0) & ~np.isnan(values)` 的两次扫描 + 两个临时布尔数组
+    融合成一个紧凑的类型化循环, 直接产出下标数组
+    """
+    idx = np.empty(values.shape[0], dtype=np.int64)
+    n = 0
+    for i in range(values.shape[0]):
+        v = values[i]
+        if v != 0.0 and not np.isnan(v):
+            idx[n] = i
+            n += 1
+    return idx[:n]
+
+
+def _indicator_series_to_records(
+    df: pd.DataFrame,
+    times: np.ndarray,
+    column_name: str,
+) -> list[dict] | None:
+    """
+    将指标列转换为 {time, value} 记录列表 (列不存在时返回 None)
+
+    过滤掉 NaN 填充的 0, 以及未填充的 NaN 本身 (NaN != 0 为 True)
+    """
+    if column_name not in df.columns:
+        return None
+    values = df[column_name].values
+    keep = _valid_value_indices(values)
+    # 列全为 0/NaN (例如预热期) 时直接返回, 不做任何逐点打包
+    if keep.size == 0:
+        return []
+    return [
+        {"time": t, "value": v}
+        for t, v in zip(times[keep].tolist(), values[keep].tolist())
+    ]
+
+
 def _build_indicators_only_response(df: pd.DataFrame, symbol: str) -> dict:
     """
     构建只包含指标的响应（不包含 candlestick 和 volume）
     """
+    times = df['time'].values
+
     def to_value_data(column_name: str) -> list[dict] | None:
-        if column_name not in df.columns:
-            return None
-        return [
-            {"time": row['time'], "value": row[column_name]}
-            for _, row in df.iterrows()
-            if row[column_name] != 0  # 过滤掉 NaN 填充的 0
-        ]
+        return _indicator_series_to_records(df, times, column_name)
 
     result = {
         "symbol": symbol,
@@ -187,73 +271,72 @@ def _build_indicators_only_response(df: pd.DataFrame, symbol: str) -> dict:
     return result
 
 
-def _build_response(df: pd.DataFrame, symbol: str) -> StockDataResponse:
+def _build_response(df: pd.DataFrame, symbol: str) -> dict:
     """
-    构建 API 响应数据
+    构建 API 响应 payload (与 StockDataResponse 同构的纯 dict)
+
+    跳过 Pydantic 模型构建, 由 stock_encoder 按固定 schema 直接编码
 
     Args:
         df: 包含所有数据的 DataFrame
         symbol: 股票代码
 
     Returns:
-        StockDataResponse 对象
+        与 StockDataResponse 同构的 dict
     """
-    # K线数据
+    # time 列只提取/转换一次, 后续所有列构建共用
+    times = df['time'].values
+    times_list = times.tolist()
+    opens = df['open'].values
+    closes = df['close'].values
+
+    # K线数据 (向量化批量导出, 避免 iterrows 逐行构造 Series)
     candlestick = [
-        CandleData(
-            time=row['time'],
-            open=row['open'],
-            high=row['high'],
-            low=row['low'],
-            close=row['close']
+        {"time": t, "open": o, "high": h, "low": l, "close": c}
+        for t, o, h, l, c in zip(
+            times_list,
+            opens.tolist(),
+            df['high'].values.tolist(),
+            df['low'].values.tolist(),
+            closes.tolist(),
         )
-        for _, row in df.iterrows()
     ]
 
-    # 成交量数据 (带颜色)
+    # 成交量数据 (颜色用 NumPy 一次性算出)
+    colors = np.where(closes >= opens, '#ef535080', '#26a69a80')
     volume = [
-        VolumeData(
-            time=row['time'],
-            value=row['vol'],
-            color='#ef535080' if row['close'] >= row['open'] else '#26a69a80'
-        )
-        for _, row in df.iterrows()
+        {"time": t, "value": v, "color": c}
+        for t, v, c in zip(times_list, df['vol'].values.tolist(), colors.tolist())
     ]
 
-    # 辅助函数: 转换 Series 为 ValueData 列表 (检查列是否存在)
-    def to_value_data(column_name: str) -> list[ValueData] | None:
-        if column_name not in df.columns:
-            return None
-        return [
-            ValueData(time=row['time'], value=row[column_name])
-            for _, row in df.iterrows()
-            if row[column_name] != 0  # 过滤掉 NaN 填充的 0
-        ]
+    # 辅助函数: 转换列为 {time, value} 记录列表 (检查列是否存在)
+    def to_value_data(column_name: str) -> list[dict] | None:
+        return _indicator_series_to_records(df, times, column_name)
 
     # 构建响应 (动态检查列是否存在)
     # 支持 SMA5/EMA5/WMA5 或统一的 MA5 列名
-    return StockDataResponse(
-        symbol=symbol,
-        candlestick=candlestick,
-        volume=volume,
-        ma5=to_value_data('MA5') or to_value_data('SMA5'),
-        ma10=to_value_data('MA10') or to_value_data('SMA10'),
-        ma20=to_value_data('MA20') or to_value_data('SMA20'),
-        ma60=to_value_data('MA60') or to_value_data('SMA60'),
-        macd=MACDData(
-            macd=to_value_data('MACD') or [],
-            signal=to_value_data('MACD_signal') or [],
-            histogram=to_value_data('MACD_hist') or [],
-        ) if 'MACD' in df.columns else None,
-        kdj=KDJData(
-            k=to_value_data('K') or [],
-            d=to_value_data('D') or [],
-            j=to_value_data('J') or [],
-        ) if 'K' in df.columns else None,
-        rsi=to_value_data('RSI'),
-        boll=BOLLData(
-            upper=to_value_data('BOLL_upper') or [],
-            middle=to_value_data('BOLL_middle') or [],
-            lower=to_value_data('BOLL_lower') or [],
-        ) if 'BOLL_upper' in df.columns else None,
-    )
+    return {
+        "symbol": symbol,
+        "candlestick": candlestick,
+        "volume": volume,
+        "ma5": to_value_data('MA5') or to_value_data('SMA5'),
+        "ma10": to_value_data('MA10') or to_value_data('SMA10'),
+        "ma20": to_value_data('MA20') or to_value_data('SMA20'),
+        "ma60": to_value_data('MA60') or to_value_data('SMA60'),
+        "macd": {
+            "macd": to_value_data('MACD') or [],
+            "signal": to_value_data('MACD_signal') or [],
+            "histogram": to_value_data('MACD_hist') or [],
+        } if 'MACD' in df.columns else None,
+        "kdj": {
+            "k": to_value_data('K') or [],
+            "d": to_value_data('D') or [],
+            "j": to_value_data('J') or [],
+        } if 'K' in df.columns else None,
+        "rsi": to_value_data('RSI'),
+        "boll": {
+            "upper": to_value_data('BOLL_upper') or [],
+            "middle": to_value_data('BOLL_middle') or [],
+            "lower": to_value_data('BOLL_lower') or [],
+        } if 'BOLL_upper' in df.columns else None,
+    }
@@ -1,15 +1,19 @@
 """
 依赖注入 - 使用 FastAPI 的 Depends 系统
 """
+from functools import lru_cache
+
 from backend.services.data_service import DataService
 from backend.services.indicator_service import IndicatorService
 
 
+@lru_cache(maxsize=1)
 def get_data_service() -> DataService:
-    """获取数据服务实例"""
+    """获取数据服务实例 (无状态, 进程内单例复用)"""
     return DataService()
 
 
+@lru_cache(maxsize=1)
 def get_indicator_service() -> IndicatorService:
-    """获取指标服务实例"""
+    """获取指标服务实例 (无状态, 进程内单例复用)"""
     return IndicatorService()
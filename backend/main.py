@@ -8,14 +8,21 @@ from pathlib import Path
 ROOT_DIR = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT_DIR))
 
+import pandas as pd
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
 from backend.core.config import API_V1_PREFIX, ALLOWED_ORIGINS
 from backend.api.routes import stock, indicators, config
 
+# 服务层的 df.copy(deep=False) 依赖写时复制语义:
+# pandas >= 3 始终启用, 2.x 需要显式打开
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
 # 创建 FastAPI 应用
 app = FastAPI(
     title="📈 Stock Analysis API",
@@ -23,6 +30,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
+    default_response_class=ORJSONResponse,  # orjson 序列化大响应比标准 json 快数倍
 )
 
 # CORS 中间件
@@ -34,6 +42,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# GZip 压缩 - 股票响应是高度可压缩的 JSON (重复的 time/value 键)
+# compresslevel=5 在压缩率和 CPU 开销之间取平衡
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # 注册路由 (使用 APIRouter 模块化)
 app.include_router(stock.router, prefix=API_V1_PREFIX)
 app.include_router(indicators.router, prefix=API_V1_PREFIX)
@@ -57,10 +69,24 @@ async def health_check():
 
 
 if __name__ == "__main__":
+    import os
     import uvicorn
-    uvicorn.run(
-        "backend.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,  # 开发模式自动重载
-    )
+
+    # DEV_RELOAD=0 切换到生产模式: uvloop 事件循环 + httptools HTTP 解析器
+    # (uvicorn[standard] 自带, Windows 开发机保持默认的 reload 模式即可)
+    if os.getenv("DEV_RELOAD", "1") == "1":
+        uvicorn.run(
+            "backend.main:app",
+            host="0.0.0.0",
+            port=8000,
+            reload=True,  # 开发模式自动重载
+        )
+    else:
+        uvicorn.run(
+            "backend.main:app",
+            host="0.0.0.0",
+            port=8000,
+            loop="uvloop",
+            http="httptools",
+            workers=min(os.cpu_count() or 1, 4),
+        )
@@ -1,12 +1,13 @@
 """
 Pydantic 模型 - 类型安全的数据结构
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List
 
 
 class CandleData(BaseModel):
     """K线数据点"""
+    model_config = ConfigDict(extra='ignore', frozen=True)
     time: str = Field(..., description="日期 YYYY-MM-DD")
     open: float
     high: float
@@ -16,12 +17,14 @@ class CandleData(BaseModel):
 
 class ValueData(BaseModel):
     """通用值数据点 (用于均线、指标等)"""
+    model_config = ConfigDict(extra='ignore', frozen=True)
     time: str
     value: float
 
 
 class VolumeData(BaseModel):
     """成交量数据点"""
+    model_config = ConfigDict(extra='ignore', frozen=True)
     time: str
     value: float
     color: str | None = None
@@ -29,6 +32,7 @@ class VolumeData(BaseModel):
 
 class MACDData(BaseModel):
     """MACD 指标数据"""
+    model_config = ConfigDict(extra='ignore', frozen=True)
     macd: List[ValueData]
     signal: List[ValueData]
     histogram: List[ValueData]
@@ -36,6 +40,7 @@ class MACDData(BaseModel):
 
 class KDJData(BaseModel):
     """KDJ 指标数据"""
+    model_config = ConfigDict(extra='ignore', frozen=True)
     k: List[ValueData]
     d: List[ValueData]
     j: List[ValueData]
@@ -43,6 +48,7 @@ class KDJData(BaseModel):
 
 class BOLLData(BaseModel):
     """布林带数据"""
+    model_config = ConfigDict(extra='ignore', frozen=True)
     upper: List[ValueData]
     middle: List[ValueData]
     lower: List[ValueData]
@@ -50,6 +56,7 @@ class BOLLData(BaseModel):
 
 class StockDataResponse(BaseModel):
     """股票数据响应"""
+    model_config = ConfigDict(extra='ignore', frozen=True)
     symbol: str
     candlestick: List[CandleData]
     volume: List[VolumeData]
@@ -0,0 +1,60 @@
+"""
+StockDataResponse 专用 JSON 编码器
+
+思路来自 fast-json-stringify: 响应结构在启动时已知,
+按固定的字段顺序直接走一条编码路径, 不做运行时类型分发。
+路由层构建与 StockDataResponse 同构的纯 dict payload,
+由 orjson 分字段编码后拼接成完整响应字节。
+"""
+from typing import Any, Dict, Iterator
+
+import orjson
+
+# StockDataResponse 的字段顺序 (启动时固定, 编码时顺序遍历)
+STOCK_RESPONSE_FIELDS: tuple[str, ...] = (
+    'symbol',
+    'candlestick',
+    'volume',
+    'ma5',
+    'ma10',
+    'ma20',
+    'ma60',
+    'macd',
+    'kdj',
+    'rsi',
+    'boll',
+)
+
+
+def iter_stock_response_fragments(payload: Dict[str, Any]) -> Iterator[bytes]:
+    """
+    按字段顺序逐块产出 JSON 片段
+
+    每个顶层字段独立用 orjson 编码, 产出形如
+    b'{"symbol":...' / b',"candlestick":[...]' / ... / b'}' 的字节片段。
+
+    Args:
+        payload: 与 StockDataResponse 同构的 dict
+
+    Yields:
+        JSON 字节片段, 拼接后为完整响应体
+    """
+    first = True
+    for field in STOCK_RESPONSE_FIELDS:
+        prefix = b'{' if first else b','
+        yield prefix + b'"' + field.encode() + b'":' + orjson.dumps(payload.get(field))
+        first = False
+    yield b'}'
+
+
+def encode_stock_response(payload: Dict[str, Any]) -> bytes:
+    """
+    将响应 payload 编码为完整 JSON 字节
+
+    Args:
+        payload: 与 StockDataResponse 同构的 dict
+
+    Returns:
+        JSON 字节串 (可直接作为 Response body)
+    """
+    return b''.join(iter_stock_response_fragments(payload))
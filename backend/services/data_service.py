@@ -2,9 +2,15 @@
 数据加载服务 - 负责读取和预处理 CSV 数据
 """
 import pandas as pd
+from collections import OrderedDict
 from pathlib import Path
 from backend.core.config import DATA_DIR
 
+# 进程内 LRU 缓存: (symbol, 文件 mtime_ns) -> 处理后的 DataFrame
+# 文件被更新后 mtime 变化, 旧缓存条目自然失效
+_CACHE_MAX_SIZE = 32
+_df_cache: OrderedDict[tuple[str, int], pd.DataFrame] = OrderedDict()
+
 
 class DataService:
     """数据服务类"""
@@ -14,6 +20,9 @@ class DataService:
         """
         加载股票数据
 
+        命中缓存时直接返回已处理的 DataFrame (下游只做筛选/重命名,
+        不会原地修改), 避免重复的 CSV 解析、日期转换和排序。
+
         Args:
             symbol: 股票代码
 
@@ -25,14 +34,28 @@ class DataService:
         if not csv_path.exists():
             raise FileNotFoundError(f"Data file not found: {csv_path}")
 
-        # 读取 CSV
-        df = pd.read_csv(csv_path)
+        # 缓存查找 (以 mtime 保证数据新鲜度)
+        cache_key = (symbol, csv_path.stat().st_mtime_ns)
+        cached = _df_cache.get(cache_key)
+        if cached is not None:
+            _df_cache.move_to_end(cache_key)
+            return cached
+
+        # 读取 CSV (pyarrow 引擎多线程解析, 大文件明显快于默认 C 引擎)
+        df = pd.read_csv(csv_path, engine='pyarrow')
 
         # 转换日期格式 (YYYYMMDD -> YYYY-MM-DD)
         df['trade_date'] = pd.to_datetime(df['trade_date'], format='%Y%m%d')
-        df['time'] = df['trade_date'].dt.strftime('%Y-%m-%d')
+        # datetime64[D] -> U10 是 NumPy C 级的 ISO 格式化,
+        # 替代 dt.strftime 的逐行 Python 级格式化
+        df['time'] = df['trade_date'].values.astype('datetime64[D]').astype('U10')
 
         # 按日期排序 (从旧到新)
         df = df.sort_values('trade_date').reset_index(drop=True)
 
+        # 写入缓存, 超出容量时淘汰最久未用的条目
+        _df_cache[cache_key] = df
+        if len(_df_cache) > _CACHE_MAX_SIZE:
+            _df_cache.popitem(last=False)
+
         return df
@@ -2,25 +2,38 @@
 指标参数解析器
 解析URL查询参数中的indicators配置，动态计算指标
 """
-from typing import List, Dict, Any
-from dataclasses import dataclass
+import re
+from typing import List, Dict, Any, NamedTuple, Tuple
+from functools import lru_cache
+import numpy as np
 import pandas as pd
 
 from .indicators import (
-    calculate_sma,
     calculate_ema,
     calculate_wma,
     calculate_kdj,
     calculate_macd,
     calculate_rsi,
-    calculate_bollinger_bands,
 )
+from .indicators._cache import df_fingerprint, get_cached_arrays, store_arrays
 
+# 预编译的参数正则: 一次 C 级扫描替代 split/strip/int 的多次
+# Python 级调用与临时 list。全部锚定整串 (fullmatch), 非法输入
+# (负数/小数/尾随垃圾) 与基线的 split+int 实现一样抛 ValueError
+_INT_RE = re.compile(r'\d+')
+_PERIODS_RE = re.compile(r'\s*\d+(?:\s*,\s*\d+)*\s*')
+_TRIPLE_RE = re.compile(r'\s*(\d+)\s*-\s*(\d+)\s*-\s*(\d+)\s*')
+# 基线对 BOLL 容忍第二段之后的多余 "-xxx" 段, 保持兼容
+_BOLL_RE = re.compile(r'\s*(\d+)\s*-\s*([\d.]+)\s*(?:-.*)?')
+_SEP_RE = re.compile(r'[;|]')
 
-@dataclass
-class IndicatorRequest:
+
+class IndicatorRequest(NamedTuple):
     """
     单个指标的请求配置
+
+    NamedTuple 而非 dataclass: 无 __dict__ 分配, 属性走 C 级下标访问,
+    且实例不可变可哈希, 适合放进解析缓存里只读共享
     """
     indicator_id: str  # 指标类型：ma, kdj, macd, rsi, boll
     parameters: Dict[str, Any]  # 参数字典
@@ -44,7 +57,9 @@ class IndicatorParser:
     @staticmethod
     def parse(indicators_str: str) -> List[IndicatorRequest]:
         """
-        解析indicators参数字符串
+        解析indicators参数字符串 (结果按原始字符串缓存)
+
+        前端会反复发送同一份配置串, 命中缓存时解析退化为一次 dict 查找
 
         Args:
             indicators_str: 指标配置字符串
@@ -57,48 +72,7 @@ class IndicatorParser:
         """
         if not indicators_str or indicators_str.strip() == "":
             return []
-
-        requests = []
-
-        # 按分号或竖线分割各个指标（兼容多种分隔符）
-        indicator_parts = indicators_str.split(';') if ';' in indicators_str else indicators_str.split('|')
-
-        for part in indicator_parts:
-            part = part.strip()
-            if not part:
-                continue
-
-            # 解析单个指标
-            if ':' not in part:
-                raise ValueError(f"Invalid indicator format: '{part}'. Expected format: 'indicator_id:params'")
-
-            indicator_id, params_str = part.split(':', 1)
-            indicator_id = indicator_id.strip().lower()
-            params_str = params_str.strip()
-
-            # 根据指标类型解析参数
-            try:
-                if indicator_id == 'ma':
-                    parameters = IndicatorParser._parse_ma_params(params_str)
-                elif indicator_id == 'kdj':
-                    parameters = IndicatorParser._parse_kdj_params(params_str)
-                elif indicator_id == 'macd':
-                    parameters = IndicatorParser._parse_macd_params(params_str)
-                elif indicator_id == 'rsi':
-                    parameters = IndicatorParser._parse_rsi_params(params_str)
-                elif indicator_id == 'boll':
-                    parameters = IndicatorParser._parse_boll_params(params_str)
-                else:
-                    raise ValueError(f"Unknown indicator: {indicator_id}")
-
-                requests.append(IndicatorRequest(
-                    indicator_id=indicator_id,
-                    parameters=parameters
-                ))
-            except Exception as e:
-                raise ValueError(f"Failed to parse {indicator_id} parameters '{params_str}': {str(e)}")
-
-        return requests
+        return list(_parse_cached(indicators_str.strip()))
 
     @staticmethod
     def _parse_ma_params(params_str: str) -> Dict[str, Any]:
@@ -118,7 +92,10 @@ class IndicatorParser:
             ma_type = 'sma'
             periods_str = params_str
 
-        periods = [int(p.strip()) for p in periods_str.split(',')]
+        if _PERIODS_RE.fullmatch(periods_str) is None:
+            raise ValueError(f"Invalid MA periods: '{periods_str}'. Expected comma-separated integers")
+        # periods 用 tuple, 保证缓存共享的解析结果不可变
+        periods = tuple(map(int, _INT_RE.findall(periods_str)))
         return {"ma_type": ma_type, "periods": periods}
 
     @staticmethod
@@ -126,14 +103,15 @@ class IndicatorParser:
         """
         解析KDJ参数: "9-3-3" → {"fastk_period": 9, "slowk_period": 3, "slowd_period": 3}
         """
-        parts = params_str.split('-')
-        if len(parts) != 3:
+        match = _TRIPLE_RE.fullmatch(params_str)
+        if match is None:
             raise ValueError("KDJ requires 3 parameters: fastk-slowk-slowd")
 
+        fastk, slowk, slowd = map(int, match.groups())
         return {
-            "fastk_period": int(parts[0]),
-            "slowk_period": int(parts[1]),
-            "slowd_period": int(parts[2])
+            "fastk_period": fastk,
+            "slowk_period": slowk,
+            "slowd_period": slowd
         }
 
     @staticmethod
@@ -141,14 +119,15 @@ class IndicatorParser:
         """
         解析MACD参数: "12-26-9" → {"fast_period": 12, "slow_period": 26, "signal_period": 9}
         """
-        parts = params_str.split('-')
-        if len(parts) != 3:
+        match = _TRIPLE_RE.fullmatch(params_str)
+        if match is None:
             raise ValueError("MACD requires 3 parameters: fast-slow-signal")
 
+        fast, slow, signal = map(int, match.groups())
         return {
-            "fast_period": int(parts[0]),
-            "slow_period": int(parts[1]),
-            "signal_period": int(parts[2])
+            "fast_period": fast,
+            "slow_period": slow,
+            "signal_period": signal
         }
 
     @staticmethod
@@ -163,12 +142,12 @@ class IndicatorParser:
         """
         解析BOLL参数: "20-2.0" → {"period": 20, "nbdev_up": 2.0, "nbdev_down": 2.0}
         """
-        parts = params_str.split('-')
-        if len(parts) < 2:
+        match = _BOLL_RE.fullmatch(params_str)
+        if match is None:
             raise ValueError("BOLL requires at least 2 parameters: period-nbdev")
 
-        period = int(parts[0])
-        nbdev = float(parts[1])
+        period = int(match.group(1))
+        nbdev = float(match.group(2))
 
         return {
             "period": period,
@@ -177,6 +156,85 @@ class IndicatorParser:
         }
 
 
+# 指标ID -> 参数解析函数 (模块级分发表, 导入时建一次)
+_PARAM_PARSERS = {
+    'ma': IndicatorParser._parse_ma_params,
+    'kdj': IndicatorParser._parse_kdj_params,
+    'macd': IndicatorParser._parse_macd_params,
+    'rsi': IndicatorParser._parse_rsi_params,
+    'boll': IndicatorParser._parse_boll_params,
+}
+
+
+@lru_cache(maxsize=512)
+def _parse_cached(indicators_str: str) -> Tuple[IndicatorRequest, ...]:
+    """
+    实际的解析逻辑 (按归一化后的字符串缓存)
+
+    返回 tuple, 缓存命中方之间只读共享
+    """
+    requests = []
+
+    # 按分号或竖线分割各个指标（兼容多种分隔符, 一次扫描同时处理两种）
+    indicator_parts = _SEP_RE.split(indicators_str)
+
+    for part in indicator_parts:
+        part = part.strip()
+        if not part:
+            continue
+
+        # 解析单个指标
+        if ':' not in part:
+            raise ValueError(f"Invalid indicator format: '{part}'. Expected format: 'indicator_id:params'")
+
+        indicator_id, params_str = part.split(':', 1)
+        indicator_id = indicator_id.strip()
+        # ID 几乎总是已经小写, islower 是单次 C 级扫描, 省掉多余的字符串分配
+        if not indicator_id.islower():
+            indicator_id = indicator_id.lower()
+        params_str = params_str.strip()
+
+        # 根据指标类型解析参数 (查分发表, 免去逐个 elif 比较)
+        param_parser = _PARAM_PARSERS.get(indicator_id)
+        try:
+            if param_parser is None:
+                raise ValueError(f"Unknown indicator: {indicator_id}")
+            parameters = param_parser(params_str)
+
+            requests.append(IndicatorRequest(
+                indicator_id=indicator_id,
+                parameters=parameters
+            ))
+        except Exception as e:
+            raise ValueError(f"Failed to parse {indicator_id} parameters '{params_str}': {str(e)}")
+
+    return tuple(requests)
+
+
+def _shared_cumsum(ctx: Dict[str, np.ndarray]) -> np.ndarray:
+    """close 的前缀和, 首次访问时构建并挂在 ctx 里供 SMA/BOLL 复用"""
+    cs = ctx.get('cumsum')
+    if cs is None:
+        close = ctx['close']
+        cs = np.empty(len(close) + 1, dtype=np.float64)
+        cs[0] = 0.0
+        np.cumsum(close, out=cs[1:])
+        ctx['cumsum'] = cs
+    return cs
+
+
+def _shared_cumsum2(ctx: Dict[str, np.ndarray]) -> np.ndarray:
+    """close 平方的前缀和 (BOLL 标准差用), 同样惰性构建一次"""
+    cs2 = ctx.get('cumsum2')
+    if cs2 is None:
+        close = ctx['close']
+        cs2 = np.empty(len(close) + 1, dtype=np.float64)
+        cs2[0] = 0.0
+        np.cumsum(close * close, out=cs2[1:])
+        ctx['cumsum2'] = cs2
+    return cs2
+
+
 class IndicatorCalculator:
     """
     指标计算器 - 根据解析后的请求计算指标
@@ -194,89 +252,199 @@ class IndicatorCalculator:
         Returns:
             添加了指标的DataFrame
         """
-        result = df.copy()
+        # 只做一次浅拷贝, 各子计算器以 inplace 方式直接添加列,
+        # 避免 N 个指标触发 N+1 次整帧深拷贝
+        result = df.copy(deep=False)
+
+        # 同一段 bar 序列 + 同一组参数的指标结果直接复用缓存数组
+        fingerprint = df_fingerprint(df)
+
+        # 价格列只提取一次, 连续 float64 数组供所有指标共享
+        # (避免每个子计算器各自触发一次 pandas 列物化)
+        # close 的前缀和/平方前缀和按需惰性构建, SMA 与 BOLL 共用同一份
+        ctx = {
+            'high': df['high'].to_numpy(dtype=np.float64),
+            'low': df['low'].to_numpy(dtype=np.float64),
+            'close': df['close'].to_numpy(dtype=np.float64),
+        }
 
-        for request in requests:
-            if request.indicator_id == 'ma':
-                result = IndicatorCalculator._calculate_ma(result, request.parameters)
-            elif request.indicator_id == 'kdj':
-                result = IndicatorCalculator._calculate_kdj(result, request.parameters)
-            elif request.indicator_id == 'macd':
-                result = IndicatorCalculator._calculate_macd(result, request.parameters)
-            elif request.indicator_id == 'rsi':
-                result = IndicatorCalculator._calculate_rsi(result, request.parameters)
-            elif request.indicator_id == 'boll':
-                result = IndicatorCalculator._calculate_boll(result, request.parameters)
+        # 本次调用里每个 MA{period} 列由哪种 ma_type 产出 (列名 → 类型):
+        # 周期去重与缓存补列都按它比对, 只看列存在性会把其他类型
+        # 先写入的同名列 (如 EMA20) 误认成现成的 SMA20
+        ma_provenance: Dict[str, str] = {}
+        ctx['ma_provenance'] = ma_provenance
+
+        # 所有新列先收集在 dict 里, 最后一次 assign 批量挂载:
+        # 单次 BlockManager 追加, 避免逐列插入在混合 dtype 帧上的反复整理
+        new_cols: Dict[str, np.ndarray] = {}
 
-        # 填充NaN
-        result = result.fillna(0)
+        for request in requests:
+            cache_key = (
+                fingerprint,
+                request.indicator_id,
+                tuple(sorted(request.parameters.items())),
+            )
+            cached = get_cached_arrays(cache_key)
+            if cached is not None:
+                # 命中: 直接取缓存数组, 不重算
+                new_cols.update(cached)
+                for column, array in cached.items():
+                    # 草稿帧上也登记列名, 缓存补列要从这里取现成数组
+                    result[column] = array
+                    if request.indicator_id == 'ma':
+                        ma_provenance[column] = request.parameters.get('ma_type', 'sma')
+                continue
 
-        return result
+            columns_before = set(result.columns)
+
+            calculator = _CALCULATORS.get(request.indicator_id)
+            if calculator is not None:
+                result = calculator(result, request.parameters, ctx)
+
+            # 未命中: 新增列转 float32 并把 NaN 归零后写入缓存
+            # (float32 带宽减半; 逐列 nan_to_num 替代整帧 fillna 的全量拷贝,
+            #  指标 NaN 只出现在预热期, 无需扫描 OHLCV 原始列)
+            computed = {}
+            for column in result.columns:
+                if column in columns_before:
+                    continue
+                array = result[column].to_numpy(dtype=np.float32)
+                # 列本身已是 float32 时 to_numpy 返回 CoW 只读视图, 须拷贝后归零
+                array = np.nan_to_num(array, copy=not array.flags.writeable, nan=0.0)
+                computed[column] = array
+                new_cols[column] = array
+
+            # MA 的周期去重会跳过同一次调用里前面请求已产出的列
+            # (如 ma:5,20;ma:20,60 的第二个请求不再重算 MA20), 但缓存条目
+            # 必须覆盖本请求的全部周期, 否则单独请求 ma:20,60 时会命中
+            # 缺列的条目; 这里从草稿帧把被去重的列补进 computed。
+            # 数组必须重新从草稿帧取: 跨类型重算 (如 EMA20 之后再算 SMA20)
+            # 只是覆盖既有列, 不算"新增", 上面的采集循环不会刷新
+            # new_cols 里同名槽位残留的旧类型数组
+            if request.indicator_id == 'ma':
+                for period in request.parameters.get('periods', ()):
+                    column = f'MA{period}'
+                    if column in computed or column not in result.columns:
+                        continue
+                    array = result[column].to_numpy(dtype=np.float32)
+                    array = np.nan_to_num(
+                        array, copy=not array.flags.writeable, nan=0.0
+                    )
+                    new_cols[column] = array
+                    computed[column] = array
+            store_arrays(cache_key, computed)
+
+        if not new_cols:
+            return result
+        return df.assign(**new_cols)
 
     @staticmethod
-    def _calculate_ma(df: pd.DataFrame, params: Dict[str, Any]) -> pd.DataFrame:
+    def _calculate_ma(df: pd.DataFrame, params: Dict[str, Any], ctx: Dict[str, Any]) -> pd.DataFrame:
         """计算MA - 支持多周期和多类型 (SMA/EMA/WMA)"""
-        result = df.copy()
         ma_type = params.get('ma_type', 'sma').lower()
-        periods = params.get('periods', [20])
+        periods = params.get('periods', (20,))
+        # 去重按 (ma_type, 周期) 比对: 同名 MA20 列可能是本次调用里
+        # 其他类型先产出的 (如 EMA20), 那时要重算并覆盖而不是复用
+        provenance = ctx['ma_provenance']
 
-        # 选择对应的计算函数
+        # SMA: 共享前缀和后每个周期只剩一次切片相减,
+        # O(N + P) 替代 P 次独立的全列扫描; 前缀和与 BOLL 复用同一份
         if ma_type == 'sma':
-            calculate_func = calculate_sma
-            source_prefix = 'SMA'
-        elif ma_type == 'ema':
+            n = len(ctx['close'])
+            cs = _shared_cumsum(ctx)
+            for period in periods:
+                col_name = f'MA{period}'
+                if provenance.get(col_name) == ma_type or period > n:
+                    continue
+                ma = np.full(n, np.nan, dtype=np.float64)
+                ma[period - 1:] = (cs[period:] - cs[:-period]) / period
+                df[col_name] = ma
+                provenance[col_name] = ma_type
+            return df
+
+        # 选择对应的计算函数 (SMA 已在上面走前缀和路径)
+        if ma_type == 'ema':
             calculate_func = calculate_ema
-            source_prefix = 'EMA'
         elif ma_type == 'wma':
             calculate_func = calculate_wma
-            source_prefix = 'WMA'
         else:
             raise ValueError(f"Unknown MA type: {ma_type}")
 
-        # 计算所有周期并重命名为统一的列名
+        # 直接以统一的 MA{period} 列名输出, 省掉重命名+drop 的整帧拷贝
+        # 多个同类型 ma 配置出现重复周期时只计算一次
         for period in periods:
-            result = calculate_func(result, period)
-            # 将 SMA5/EMA5/WMA5 重命名为统一的 MA5
-            source_col = f'{source_prefix}{period}'
-            target_col = f'MA{period}'
-            if source_col in result.columns:
-                result[target_col] = result[source_col]
-                # 删除原列（可选）
-                result = result.drop(columns=[source_col])
+            col_name = f'MA{period}'
+            if provenance.get(col_name) == ma_type:
+                continue
+            calculate_func(df, period, col_name=col_name, inplace=True, close=ctx['close'])
+            provenance[col_name] = ma_type
 
-        return result
+        return df
 
     @staticmethod
-    def _calculate_kdj(df: pd.DataFrame, params: Dict[str, Any]) -> pd.DataFrame:
+    def _calculate_kdj(df: pd.DataFrame, params: Dict[str, Any], ctx: Dict[str, np.ndarray]) -> pd.DataFrame:
         """计算KDJ"""
         return calculate_kdj(
             df,
             fastk_period=params.get('fastk_period', 9),
             slowk_period=params.get('slowk_period', 3),
-            slowd_period=params.get('slowd_period', 3)
+            slowd_period=params.get('slowd_period', 3),
+            inplace=True,
+            high=ctx['high'],
+            low=ctx['low'],
+            close=ctx['close'],
         )
 
     @staticmethod
-    def _calculate_macd(df: pd.DataFrame, params: Dict[str, Any]) -> pd.DataFrame:
+    def _calculate_macd(df: pd.DataFrame, params: Dict[str, Any], ctx: Dict[str, np.ndarray]) -> pd.DataFrame:
         """计算MACD"""
         return calculate_macd(
             df,
             fast_period=params.get('fast_period', 12),
             slow_period=params.get('slow_period', 26),
-            signal_period=params.get('signal_period', 9)
+            signal_period=params.get('signal_period', 9),
+            inplace=True,
+            close=ctx['close'],
         )
 
     @staticmethod
-    def _calculate_rsi(df: pd.DataFrame, params: Dict[str, Any]) -> pd.DataFrame:
+    def _calculate_rsi(df: pd.DataFrame, params: Dict[str, Any], ctx: Dict[str, np.ndarray]) -> pd.DataFrame:
         """计算RSI"""
-        return calculate_rsi(df, period=params.get('period', 14))
+        return calculate_rsi(df, period=params.get('period', 14), inplace=True, close=ctx['close'])
 
     @staticmethod
-    def _calculate_boll(df: pd.DataFrame, params: Dict[str, Any]) -> pd.DataFrame:
-        """计算BOLL"""
-        return calculate_bollinger_bands(
-            df,
-            period=params.get('period', 20),
-            nbdev_up=params.get('nbdev_up', 2.0),
-            nbdev_down=params.get('nbdev_down', 2.0)
-        )
+    def _calculate_boll(df: pd.DataFrame, params: Dict[str, Any], ctx: Dict[str, np.ndarray]) -> pd.DataFrame:
+        """计算BOLL - 中轨/标准差由共享前缀和推出, 与 SMA 同源不重扫 close"""
+        period = params.get('period', 20)
+        nbdev_up = params.get('nbdev_up', 2.0)
+        nbdev_down = params.get('nbdev_down', 2.0)
+
+        n = len(ctx['close'])
+        upper = np.full(n, np.nan, dtype=np.float64)
+        middle = np.full(n, np.nan, dtype=np.float64)
+        lower = np.full(n, np.nan, dtype=np.float64)
+        if period <= n:
+            cs = _shared_cumsum(ctx)
+            cs2 = _shared_cumsum2(ctx)
+            mean = (cs[period:] - cs[:-period]) / period
+            var = (cs2[period:] - cs2[:-period]) / period - mean * mean
+            np.maximum(var, 0.0, out=var)  # 浮点误差可能产生微小负方差
+            sd = np.sqrt(var)
+            middle[period - 1:] = mean
+            upper[period - 1:] = mean + nbdev_up * sd
+            lower[period - 1:] = mean - nbdev_down * sd
+
+        df['BOLL_upper'] = upper
+        df['BOLL_middle'] = middle
+        df['BOLL_lower'] = lower
+        return df
+
+
+# 指标ID -> 计算函数的分发表 (与解析端的 _PARAM_PARSERS 对应)
+_CALCULATORS = {
+    'ma': IndicatorCalculator._calculate_ma,
+    'kdj': IndicatorCalculator._calculate_kdj,
+    'macd': IndicatorCalculator._calculate_macd,
+    'rsi': IndicatorCalculator._calculate_rsi,
+    'boll': IndicatorCalculator._calculate_boll,
+}
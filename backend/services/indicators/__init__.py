@@ -16,6 +16,7 @@ from .base import (
 # 移动平均线系列
 from .moving_average import (
     calculate_sma,
+    calculate_sma_multi,
     calculate_ema,
     calculate_wma,
     MA_METADATA,
@@ -46,10 +47,16 @@ from .bollinger import (
     BOLL_METADATA,
 )
 
+# Numba 核预热: worker 进程导入时编译/加载磁盘缓存, 首个请求不再付 JIT 成本
+from ._kernels import warmup as _warmup_kernels
+
+_warmup_kernels()
+
 # 元数据注册表
 from .metadata_registry import (
     INDICATOR_METADATA_REGISTRY,
     get_indicator_metadata,
+    get_indicator_metadata_json,
     get_all_indicators,
     get_indicators_by_category,
     indicator_exists,
@@ -65,6 +72,7 @@ __all__ = [
     'IndicatorCategory',
     # 移动平均线
     'calculate_sma',
+    'calculate_sma_multi',
     'calculate_ema',
     'calculate_wma',
     'MA_METADATA',
@@ -84,6 +92,7 @@ __all__ = [
     # 元数据注册表
     'INDICATOR_METADATA_REGISTRY',
     'get_indicator_metadata',
+    'get_indicator_metadata_json',
     'get_all_indicators',
     'get_indicators_by_category',
     'indicator_exists',
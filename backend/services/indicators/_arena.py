@@ -0,0 +1,45 @@
+"""
+线程本地的 float64 暂存缓冲池
+
+各计算核的 float64 输出只是中转: 返回前都会 astype 降为 float32
+拷贝进缓存/结果帧, 之后即弃。没必要每次请求都 np.empty 新分配 --
+按形状复用同一块已触页的热缓冲, 省掉分配器压力和长序列的缺页开销。
+
+使用约定: 取到的缓冲在下一次同形状取用前必须消费完毕
+(降位拷贝或写入别处), 不得长期持有其引用或视图。
+"""
+import threading
+from collections import OrderedDict
+from typing import Tuple
+
+import numpy as np
+
+# 每线程最多驻留的形状数, 超出时淘汰最久未用的缓冲
+_POOL_MAX_SIZE = 16
+
+_local = threading.local()
+
+
+def get_scratch(rows: int, n: int) -> np.ndarray:
+    """
+    取一块 (rows, n) 的 float64 暂存缓冲 (按线程 + 形状复用)
+
+    Args:
+        rows: 输出路数 (如 MACD 三路为 3)
+        n: 序列长度
+
+    Returns:
+        未初始化的 float64 数组, 行间连续 (行可直接作 1D 核输出)
+    """
+    pool: "OrderedDict[Tuple[int, int], np.ndarray]" = getattr(_local, 'pool', None)
+    if pool is None:
+        pool = _local.pool = OrderedDict()
+    key = (rows, n)
+    buf = pool.get(key)
+    if buf is not None:
+        pool.move_to_end(key)
+        return buf
+    buf = pool[key] = np.empty((rows, n), dtype=np.float64)
+    if len(pool) > _POOL_MAX_SIZE:
+        pool.popitem(last=False)
+    return buf
@@ -0,0 +1,76 @@
+"""
+指标结果缓存
+
+按 (bar 序列指纹, 指标ID, 参数) 缓存指标输出的 NumPy 数组。
+重复轮询同一段 K 线时, 整个指标计算退化为一次 dict 查找 + O(1) 列挂载。
+"""
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+_CACHE_MAX_SIZE = 2048
+_result_cache: OrderedDict[tuple, Dict[str, np.ndarray]] = OrderedDict()
+
+# 单条输出数组的内容哈希缓存 (calculate_sma/ema/wma/rsi 级别)
+_series_cache: OrderedDict[tuple, np.ndarray] = OrderedDict()
+
+
+def df_fingerprint(df: pd.DataFrame) -> tuple:
+    """
+    计算一段 bar 序列的内容指纹
+
+    对 close/high/low 各做一次 C 级字节哈希: 元数据近似 (长度/首末值)
+    会让交易日历相同、末收盘价相同的不同股票共享缓存条目 --
+    A 股两位小数的价格下这种碰撞是常态而非理论; 内容哈希仍远快于
+    重跑一遍指标计算
+    """
+    if len(df) == 0:
+        return (0,)
+    return (
+        len(df),
+        hash(df['close'].to_numpy(dtype=np.float64).tobytes()),
+        hash(df['high'].to_numpy(dtype=np.float64).tobytes()),
+        hash(df['low'].to_numpy(dtype=np.float64).tobytes()),
+    )
+
+
+def get_cached_arrays(cache_key: tuple) -> Optional[Dict[str, np.ndarray]]:
+    """查询缓存, 命中时返回 {列名: 数组} 并刷新 LRU 位置"""
+    arrays = _result_cache.get(cache_key)
+    if arrays is not None:
+        _result_cache.move_to_end(cache_key)
+    return arrays
+
+
+def store_arrays(cache_key: tuple, arrays: Dict[str, np.ndarray]) -> None:
+    """写入缓存, 超出容量时淘汰最久未用的条目"""
+    _result_cache[cache_key] = arrays
+    if len(_result_cache) > _CACHE_MAX_SIZE:
+        _result_cache.popitem(last=False)
+
+
+def close_key(close: np.ndarray) -> int:
+    """
+    close 数组的内容哈希
+
+    一次 C 级字节哈希扫描, 远快于重跑一遍指标计算 + 整帧拷贝;
+    同一段序列的重复请求 (如只改颜色参数) 直接命中
+    """
+    return hash(close.tobytes())
+
+
+def get_cached_series(cache_key: tuple) -> Optional[np.ndarray]:
+    """查询单数组缓存, 命中时刷新 LRU 位置"""
+    array = _series_cache.get(cache_key)
+    if array is not None:
+        _series_cache.move_to_end(cache_key)
+    return array
+
+
+def store_series(cache_key: tuple, array: np.ndarray) -> None:
+    """写入单数组缓存, 超出容量时淘汰最久未用的条目"""
+    _series_cache[cache_key] = array
+    if len(_series_cache) > _CACHE_MAX_SIZE:
+        _series_cache.popitem(last=False)
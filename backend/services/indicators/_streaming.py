@@ -0,0 +1,201 @@
+"""
+增量指标更新核 - 面向逐 bar 追加的实时场景
+
+批量函数每来一根新 bar 就全量重算是 O(N); 这里维护环形缓冲 +
+运行和等常量状态, 单根 bar 的更新降为 O(1)。
+冷启动 (历史回填) 仍走批量版本, 之后用 *_init 接管状态继续推进。
+"""
+from functools import lru_cache
+from typing import Dict, Tuple
+
+import numpy as np
+from numba import njit, types
+
+_F8 = types.float64
+_I8 = types.int64
+_F8_BUF = types.float64[::1]
+
+
+@njit(
+    types.Tuple((_F8, _I8, _F8))(_F8_BUF, _I8, _F8, _F8, _I8),
+    cache=True, fastmath=True, boundscheck=False,
+)
+def sma_update(buf, head, running_sum, new_x, period):
+    """
+    SMA 单 bar 更新: 运行和减出窗值、加新值, O(1)
+
+    buf 是长度为 period 的环形缓冲, head 指向最旧元素;
+    返回 (新SMA, 新head, 新运行和), buf 就地更新
+    """
+    running_sum += new_x - buf[head]
+    buf[head] = new_x
+    head = (head + 1) % period
+    return running_sum / period, head, running_sum
+
+
+@njit(_F8(_F8, _F8, _F8), cache=True, fastmath=True)
+def ema_update(prev_ema, new_x, alpha):
+    """EMA 单 bar 更新: 一次乘加, 状态只有上一个 EMA 标量"""
+    return prev_ema + alpha * (new_x - prev_ema)
+
+
+@njit(
+    types.Tuple((_F8, _I8, _F8, _F8))(_F8_BUF, _I8, _F8, _F8, _F8, _I8),
+    cache=True, fastmath=True, boundscheck=False,
+)
+def wma_update(buf, head, total, weighted, new_x, period):
+    """
+    WMA 单 bar 更新 (权重 1..period, 最新权重最大), O(1)
+
+    滑动一格等价于: 加权和先整体降一级权重 (减去普通和),
+    再挂上权重为 period 的新值; 普通和按环形缓冲常规进出
+    """
+    oldest = buf[head]
+    weighted = weighted - total + period * new_x
+    total = total - oldest + new_x
+    buf[head] = new_x
+    head = (head + 1) % period
+    denom = period * (period + 1) / 2.0
+    return weighted / denom, head, total, weighted
+
+
+@njit(
+    types.Tuple((_F8, _F8, _F8))(_F8, _F8, _F8, _F8, _I8),
+    cache=True, fastmath=True,
+)
+def rsi_update(prev_avg_gain, prev_avg_loss, prev_close, new_close, period):
+    """
+    RSI 单 bar 更新: Wilder 平滑的平均涨/跌幅各一个标量状态, O(1)
+
+    返回 (新RSI, 新平均涨幅, 新平均跌幅);
+    涨跌幅同时为零时按 talib 约定输出 0
+    """
+    diff = new_close - prev_close
+    gain = diff if diff > 0.0 else 0.0
+    loss = -diff if diff < 0.0 else 0.0
+    avg_gain = (prev_avg_gain * (period - 1) + gain) / period
+    avg_loss = (prev_avg_loss * (period - 1) + loss) / period
+    denom = avg_gain + avg_loss
+    rsi = 100.0 * avg_gain / denom if denom != 0.0 else 0.0
+    return rsi, avg_gain, avg_loss
+
+
+def _require_history(close: np.ndarray, period: int, need: int) -> None:
+    """校验种子历史长度: 不足时环形缓冲/种子均值都会悄悄算错"""
+    if len(close) < need:
+        raise ValueError(
+            f"history shorter than period: got {len(close)} bars, "
+            f"need at least {need} for period={period}"
+        )
+
+
+def sma_state_init(close: np.ndarray, period: int) -> Dict[str, object]:
+    """从历史序列初始化 SMA 增量状态 (取末尾 period 根 bar)"""
+    _require_history(close, period, period)
+    # 显式拷贝: 环形缓冲会被就地改写, 不能持有调用方数组的视图
+    buf = np.array(close[-period:], dtype=np.float64, copy=True)
+    return {'buf': buf, 'head': 0, 'sum': float(buf.sum())}
+
+
+@lru_cache(maxsize=64)
+def _ema_weights(period: int, t: int) -> np.ndarray:
+    """
+    闭式 EMA 的几何权向量 (按 (period, 序列长度) 缓存)
+
+    w[0] = (1-α)^(t-1) 作用在种子上, 其后 w[j] = α(1-α)^(t-1-j)
+    """
+    alpha = 2.0 / (period + 1.0)
+    w = (1.0 - alpha) ** np.arange(t - 1, -1, -1, dtype=np.float64)
+    w[1:] *= alpha
+    return w
+
+
+def ema_closed_form(x: np.ndarray, period: int) -> float:
+    """
+    闭式求序列末端的 EMA: 几何权点积代替逐元素串行递推
+
+    递推 s_t = αx_t + (1-α)s_{t-1} 展开后就是一次点积,
+    点积走 SIMD/FMA, 没有串行数据依赖; x[0] 视为种子 (权重不乘 α)
+    """
+    return float(_ema_weights(period, x.size) @ x)
+
+
+def ema_state_init(close: np.ndarray, period: int) -> Dict[str, object]:
+    """从历史序列初始化 EMA 增量状态 (与 talib 一致: SMA 种子后递推)"""
+    _require_history(close, period, period)
+    alpha = 2.0 / (period + 1.0)
+    seeded = np.empty(len(close) - period + 1, dtype=np.float64)
+    seeded[0] = np.mean(close[:period])
+    seeded[1:] = close[period:]
+    return {'ema': ema_closed_form(seeded, period), 'alpha': alpha}
+
+
+def wma_state_init(close: np.ndarray, period: int) -> Dict[str, object]:
+    """从历史序列初始化 WMA 增量状态"""
+    _require_history(close, period, period)
+    buf = np.array(close[-period:], dtype=np.float64, copy=True)
+    weights = np.arange(1, period + 1, dtype=np.float64)
+    return {
+        'buf': buf,
+        'head': 0,
+        'total': float(buf.sum()),
+        'weighted': float((buf * weights).sum()),
+    }
+
+
+def rsi_state_init(close: np.ndarray, period: int) -> Dict[str, object]:
+    """
+    从历史序列初始化 RSI 增量状态
+
+    与 talib 一致: 首 period 个涨跌差的简单均值做种子,
+    其后全程 Wilder 递推到序列末尾
+    """
+    # 涨跌差比序列短 1, 种子均值需要 period 个差值
+    _require_history(close, period, period + 1)
+    diffs = np.diff(np.asarray(close, dtype=np.float64))
+    gains = np.maximum(diffs, 0.0)
+    losses = np.maximum(-diffs, 0.0)
+    avg_gain = float(gains[:period].mean())
+    avg_loss = float(losses[:period].mean())
+    for i in range(period, len(diffs)):
+        avg_gain = (avg_gain * (period - 1) + gains[i]) / period
+        avg_loss = (avg_loss * (period - 1) + losses[i]) / period
+    return {
+        'avg_gain': avg_gain,
+        'avg_loss': avg_loss,
+        'last_close': float(close[-1]),
+        'period': period,
+    }
+
+
+def calculate_sma_incremental(state: Dict[str, object], new_close: float) -> float:
+    """推进一根新 bar, 返回最新 SMA (状态就地更新)"""
+    value, state['head'], state['sum'] = sma_update(
+        state['buf'], state['head'], state['sum'], new_close, len(state['buf'])
+    )
+    return value
+
+
+def calculate_ema_incremental(state: Dict[str, object], new_close: float) -> float:
+    """推进一根新 bar, 返回最新 EMA (状态就地更新)"""
+    state['ema'] = ema_update(state['ema'], new_close, state['alpha'])
+    return state['ema']
+
+
+def calculate_wma_incremental(state: Dict[str, object], new_close: float) -> float:
+    """推进一根新 bar, 返回最新 WMA (状态就地更新)"""
+    value, state['head'], state['total'], state['weighted'] = wma_update(
+        state['buf'], state['head'], state['total'], state['weighted'],
+        new_close, len(state['buf'])
+    )
+    return value
+
+
+def calculate_rsi_incremental(state: Dict[str, object], new_close: float) -> float:
+    """推进一根新 bar, 返回最新 RSI (状态就地更新)"""
+    value, state['avg_gain'], state['avg_loss'] = rsi_update(
+        state['avg_gain'], state['avg_loss'], state['last_close'],
+        new_close, state['period']
+    )
+    state['last_close'] = new_close
+    return value
@@ -1,9 +1,14 @@
 """
 指标参数系统 - 基础类定义
 配置驱动的指标参数管理系统
+
+metadata 类用冻结 dataclass 而非 Pydantic BaseModel:
+这些对象在导入期批量构造且运行期只读, dataclass 免掉逐字段验证开销,
+属性访问走 slots 描述符; FastAPI 的 response_model 原生支持 dataclass
 """
+from dataclasses import dataclass, asdict
 from enum import Enum
-from typing import List, Any, Dict, Optional, Union
+from typing import Any, Dict, Optional, Tuple, Union
 from pydantic import BaseModel, Field
 
 
@@ -19,81 +24,51 @@ class ParameterType(str, Enum):
     MULTI_PERIOD = "multi_period"  # 多周期选择器（MA专用）
 
 
-class ParameterOption(BaseModel):
+@dataclass(frozen=True, slots=True)
+class ParameterOption:
     """
     下拉框或多选框的选项
     """
-    value: Union[int, float, str] = Field(..., description="选项值")
-    label: str = Field(..., description="显示标签")
-
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "value": 20,
-                "label": "20日"
-            }
-        }
+    value: Union[int, float, str]  # 选项值
+    label: str                     # 显示标签
 
 
-class IndicatorParameter(BaseModel):
+@dataclass(frozen=True, slots=True)
+class IndicatorParameter:
     """
     指标参数定义
     描述单个参数的类型、约束、默认值等
     """
-    name: str = Field(..., description="参数名（英文），用于代码中引用")
-    type: ParameterType = Field(..., description="参数类型")
-    label: str = Field(..., description="显示标签（中文），用于UI展示")
-    default: Any = Field(..., description="默认值")
+    name: str             # 参数名（英文），用于代码中引用
+    type: ParameterType   # 参数类型
+    label: str            # 显示标签（中文），用于UI展示
+    default: Any          # 默认值
 
     # 可选约束
-    min: Optional[Union[int, float]] = Field(None, description="数字类型：最小值")
-    max: Optional[Union[int, float]] = Field(None, description="数字类型：最大值")
-    step: Optional[Union[int, float]] = Field(None, description="数字类型：步长")
-    options: Optional[List[ParameterOption]] = Field(None, description="下拉框/多选框：选项列表")
-    description: Optional[str] = Field(None, description="参数说明")
-
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "name": "period",
-                "type": "number",
-                "label": "周期",
-                "default": 20,
-                "min": 1,
-                "max": 500,
-                "description": "计算移动平均的周期数"
-            }
-        }
+    min: Optional[Union[int, float]] = None    # 数字类型：最小值
+    max: Optional[Union[int, float]] = None    # 数字类型：最大值
+    step: Optional[Union[int, float]] = None   # 数字类型：步长
+    options: Optional[Tuple[ParameterOption, ...]] = None  # 下拉框/多选框：选项列表
+    description: Optional[str] = None          # 参数说明
 
 
-class IndicatorMetadata(BaseModel):
+@dataclass(frozen=True, slots=True)
+class IndicatorMetadata:
     """
     指标元数据
     描述指标的基本信息和参数配置
     """
-    id: str = Field(..., description="指标唯一标识符")
-    name: str = Field(..., description="指标显示名称")
-    category: str = Field(..., description="指标分类：overlay/oscillator/volume")
-    description: str = Field(..., description="指标描述")
-    parameters: List[IndicatorParameter] = Field(..., description="参数列表")
-    display_template: str = Field(..., description="Bar显示模板类型")
-    supports_multiple: bool = Field(
-        default=False,
-        description="是否支持多实例（MA特殊，可添加多个不同配置）"
-    )
-
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "id": "ma",
-                "name": "Moving Average",
-                "category": "overlay",
-                "description": "移动平均线，显示价格趋势",
-                "parameters": [],
-                "display_template": "ma-multi",
-                "supports_multiple": True
-            }
-        }
+    id: str                        # 指标唯一标识符
+    name: str                      # 指标显示名称
+    category: str                  # 指标分类：overlay/oscillator/volume
+    description: str               # 指标描述
+    parameters: Tuple[IndicatorParameter, ...]  # 参数列表 (元组: 深度不可变, 可整体哈希)
+    display_template: str          # Bar显示模板类型
+    supports_multiple: bool = False  # 是否支持多实例（MA特殊，可添加多个不同配置）
+
+    def dict(self) -> Dict[str, Any]:
+        """递归转成普通 dict (兼容原 Pydantic 接口, ETag 计算用)"""
+        return asdict(self)
 
 
 class IndicatorConfig(BaseModel):
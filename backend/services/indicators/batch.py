@@ -0,0 +1,36 @@
+"""
+批量指标计算入口
+
+一次请求启用多个指标时, 不要逐个调 calculate_* (每次各自物化
+close 列、各自触碰 BlockManager), 而是走这里的批量接口:
+价格列只提取一次、前缀和跨指标共享、新列最终单次批量挂载,
+并复用指纹级的结果缓存。
+"""
+from typing import Any, Dict, List, Tuple
+
+import pandas as pd
+
+
+def compute_many(
+    df: pd.DataFrame,
+    specs: List[Tuple[str, Dict[str, Any]]],
+) -> pd.DataFrame:
+    """
+    按 (指标ID, 参数) 列表批量计算指标
+
+    Args:
+        df: 原始数据 (含 close, KDJ 还需 high/low)
+        specs: 例如 [('ma', {'ma_type': 'sma', 'periods': (5, 20)}),
+                     ('rsi', {'period': 14})]
+
+    Returns:
+        追加了所有指标列的新 DataFrame (原 df 不被修改)
+    """
+    # 延迟导入: indicator_parser 在导入期就引用本包, 避免环形依赖
+    from ..indicator_parser import IndicatorCalculator, IndicatorRequest
+
+    requests = [
+        IndicatorRequest(indicator_id=indicator_id, parameters=parameters)
+        for indicator_id, parameters in specs
+    ]
+    return IndicatorCalculator.calculate(df, requests)
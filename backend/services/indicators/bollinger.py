@@ -4,8 +4,10 @@
 
 配置Schema：显示上/中/下轨
 """
+import numpy as np
 import pandas as pd
-import talib
+from ._arena import get_scratch
+from ._kernels import bbands_kernel
 from .base import (
     IndicatorMetadata,
     IndicatorParameter,
@@ -18,7 +20,9 @@ def calculate_bollinger_bands(
     df: pd.DataFrame,
     period: int = 20,
     nbdev_up: float = 2.0,
-    nbdev_down: float = 2.0
+    nbdev_down: float = 2.0,
+    inplace: bool = False,
+    close: np.ndarray | None = None,
 ) -> pd.DataFrame:
     """
     计算布林带指标
@@ -33,6 +37,8 @@ def calculate_bollinger_bands(
         period: 计算周期，默认 20
         nbdev_up: 上轨标准差倍数，默认 2.0
         nbdev_down: 下轨标准差倍数，默认 2.0
+        inplace: True 时直接在 df 上添加列, 不复制 (热路径用, 避免整帧拷贝)
+        close: 可选, 预提取的收盘价数组 (多个指标共享, 省去重复列提取)
 
     Returns:
         添加了以下列的 DataFrame：
@@ -64,21 +70,34 @@ def calculate_bollinger_bands(
         - 布林带不是固定的支撑/阻力位
         - 强趋势中，价格可以沿着上轨或下轨运行
     """
-    result = df.copy()
-
-    upper, middle, lower = talib.BBANDS(
-        df['close'].values,
-        timeperiod=period,
-        nbdevup=nbdev_up,
-        nbdevdn=nbdev_down,
-        matype=0  # SMA
+    # 单遍 Numba 核: 滚动和/平方和同时得到 SMA 与标准差
+    # (替代 talib.BBANDS 对 close 的两遍独立扫描)
+    # 输出写进池化暂存缓冲, 返回前降位拷贝, 不持有缓冲引用
+    n = len(df)
+    out = get_scratch(3, n)
+    upper, middle, lower = out[0], out[1], out[2]
+    if close is None:
+        close = df['close'].to_numpy(dtype=np.float64)
+    bbands_kernel(
+        close,
+        period,
+        float(nbdev_up),
+        float(nbdev_down),
+        upper, middle, lower,
     )
 
-    result['BOLL_upper'] = upper
-    result['BOLL_middle'] = middle
-    result['BOLL_lower'] = lower
-
-    return result
+    # 递推全程 float64, 出口降为 float32 (像素精度渲染, 传输内存减半)
+    new_cols = {
+        'BOLL_upper': upper.astype(np.float32, copy=False),
+        'BOLL_middle': middle.astype(np.float32, copy=False),
+        'BOLL_lower': lower.astype(np.float32, copy=False),
+    }
+    if inplace:
+        for column, array in new_cols.items():
+            df[column] = array
+        return df
+    # 三列一次 concat 挂载, 避免逐列赋值的多轮块整理 (同 calculate_macd)
+    return pd.concat([df, pd.DataFrame(new_cols, index=df.index)], axis=1)
 
 
 def calculate_bollinger_bandwidth(df: pd.DataFrame) -> pd.DataFrame:
@@ -99,7 +118,7 @@ def calculate_bollinger_bandwidth(df: pd.DataFrame) -> pd.DataFrame:
         - 识别收窄（Squeeze）和扩张阶段
         - 宽度越小，突破概率越大
     """
-    result = df.copy()
+    result = df.copy(deep=False)
 
     if all(col in df.columns for col in ['BOLL_upper', 'BOLL_middle', 'BOLL_lower']):
         result['BOLL_bandwidth'] = (
@@ -120,7 +139,7 @@ BOLL_METADATA = IndicatorMetadata(
     description="布林带，显示价格波动区间",
     supports_multiple=False,
     display_template="boll",  # 显示上/中/下轨值
-    parameters=[
+    parameters=(
         IndicatorParameter(
             name="period",
             type=ParameterType.NUMBER,
@@ -172,5 +191,5 @@ BOLL_METADATA = IndicatorMetadata(
             default="#00C853",
             description="下轨线颜色"
         )
-    ]
+    )
 )
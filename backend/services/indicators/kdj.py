@@ -4,8 +4,10 @@ Stochastic Oscillator 的中国改良版
 
 配置Schema：显示K/D/J三条线
 """
+import numpy as np
 import pandas as pd
-import talib
+from ._arena import get_scratch
+from ._kernels import kdj_kernel
 from .base import (
     IndicatorMetadata,
     IndicatorParameter,
@@ -19,7 +21,11 @@ def calculate_kdj(
     df: pd.DataFrame,
     fastk_period: int = 9,
     slowk_period: int = 3,
-    slowd_period: int = 3
+    slowd_period: int = 3,
+    inplace: bool = False,
+    high: np.ndarray | None = None,
+    low: np.ndarray | None = None,
+    close: np.ndarray | None = None,
 ) -> pd.DataFrame:
     """
     计算 KDJ 指标
@@ -35,6 +41,8 @@ def calculate_kdj(
         fastk_period: RSV 计算周期，默认 9
         slowk_period: K 线平滑周期，默认 3
         slowd_period: D 线平滑周期，默认 3
+        inplace: True 时直接在 df 上添加列, 不复制 (热路径用, 避免整帧拷贝)
+        high/low/close: 可选, 预提取的价格数组 (多个指标共享, 省去重复列提取)
 
     Returns:
         添加了以下列的 DataFrame：
@@ -58,26 +66,39 @@ def calculate_kdj(
         - J线波动最快，K线次之，D线最慢
         - J线可以超出0-100范围
     """
-    result = df.copy()
-
-    # 使用 TA-Lib 的 STOCH 函数计算 K 和 D
-    k, d = talib.STOCH(
-        df['high'].values,
-        df['low'].values,
-        df['close'].values,
-        fastk_period=fastk_period,
-        slowk_period=slowk_period,
-        slowd_period=slowd_period
+    # 单遍 Numba 核一次算出 K/D/J (替代 talib.STOCH + J 的三遍扫描)
+    # 输出写进池化暂存缓冲, 返回前降位拷贝, 不持有缓冲引用
+    n = len(df)
+    out = get_scratch(3, n)
+    k, d, j = out[0], out[1], out[2]
+    if high is None:
+        high = df['high'].to_numpy(dtype=np.float64)
+    if low is None:
+        low = df['low'].to_numpy(dtype=np.float64)
+    if close is None:
+        close = df['close'].to_numpy(dtype=np.float64)
+    kdj_kernel(
+        high,
+        low,
+        close,
+        fastk_period,
+        slowk_period,
+        slowd_period,
+        k, d, j,
     )
 
-    # 计算 J 线：J = 3K - 2D
-    j = 3 * k - 2 * d
-
-    result['K'] = k
-    result['D'] = d
-    result['J'] = j
-
-    return result
+    # 递推全程 float64, 出口降为 float32 (像素精度渲染, 传输内存减半)
+    new_cols = {
+        'K': k.astype(np.float32, copy=False),
+        'D': d.astype(np.float32, copy=False),
+        'J': j.astype(np.float32, copy=False),
+    }
+    if inplace:
+        for column, array in new_cols.items():
+            df[column] = array
+        return df
+    # 三列一次 concat 挂载, 避免逐列赋值的多轮块整理 (同 calculate_macd)
+    return pd.concat([df, pd.DataFrame(new_cols, index=df.index)], axis=1)
 
 
 # ==================== KDJ 指标配置 Schema ====================
@@ -89,7 +110,7 @@ KDJ_METADATA = IndicatorMetadata(
     description="随机指标，判断超买超卖状态",
     supports_multiple=False,  # KDJ只能添加一个实例
     display_template="kdj-triple",  # 显示K/D/J三个值
-    parameters=[
+    parameters=(
         IndicatorParameter(
             name="fastk_period",
             type=ParameterType.NUMBER,
@@ -161,5 +182,5 @@ KDJ_METADATA = IndicatorMetadata(
             step=1,
             description="超卖区域阈值"
         )
-    ]
+    )
 )
@@ -4,8 +4,11 @@ MACD 指标 (Moving Average Convergence Divergence)
 
 配置Schema：显示DIF/DEA/MACD柱
 """
+import numpy as np
 import pandas as pd
-import talib
+from ._arena import get_scratch
+from ._cache import close_key, get_cached_arrays, store_arrays
+from ._kernels import macd_kernel
 from .base import (
     IndicatorMetadata,
     IndicatorParameter,
@@ -19,7 +22,9 @@ def calculate_macd(
     df: pd.DataFrame,
     fast_period: int = 12,
     slow_period: int = 26,
-    signal_period: int = 9
+    signal_period: int = 9,
+    inplace: bool = False,
+    close: np.ndarray | None = None,
 ) -> pd.DataFrame:
     """
     计算 MACD 指标
@@ -34,6 +39,8 @@ def calculate_macd(
         fast_period: 快线周期，默认 12
         slow_period: 慢线周期，默认 26
         signal_period: 信号线周期，默认 9
+        inplace: True 时直接在 df 上添加列, 不复制 (热路径用, 避免整帧拷贝)
+        close: 可选, 预提取的收盘价数组 (多个指标共享, 省去重复列提取)
 
     Returns:
         添加了以下列的 DataFrame：
@@ -52,20 +59,40 @@ def calculate_macd(
         - 6, 19, 9：短期趋势
         - 19, 39, 9：长期趋势
     """
-    result = df.copy()
+    values = close if close is not None else df['close'].to_numpy(dtype=np.float64)
 
-    macd, signal, histogram = talib.MACD(
-        df['close'].values,
-        fastperiod=fast_period,
-        slowperiod=slow_period,
-        signalperiod=signal_period
-    )
+    # 与 talib 一致: fastperiod > slowperiod 时交换两周期,
+    # 顺带让交换前后的参数组合落在同一个缓存条目上
+    if fast_period > slow_period:
+        fast_period, slow_period = slow_period, fast_period
 
-    result['MACD'] = macd
-    result['MACD_signal'] = signal
-    result['MACD_hist'] = histogram
+    # 按 (内容哈希, 指标, 参数) 缓存: 同一序列重复请求不重跑计算核
+    key = (close_key(values), 'macd', fast_period, slow_period, signal_period)
+    cached = get_cached_arrays(key)
+    if cached is None:
+        # 三路输出共用一块池化的连续缓冲 (跨请求复用, 已触页;
+        # 内容随即降位拷贝进缓存, 不持有缓冲引用)
+        out = get_scratch(3, len(values))
+        macd, signal, histogram = out[0], out[1], out[2]
+        # 融合核: 快/慢 EMA 与信号线在一次顺序扫描中同时递推 (见 _kernels.macd_kernel)
+        macd_kernel(values, fast_period, slow_period, signal_period, macd, signal, histogram)
+        # 递推全程 float64, 出口降为 float32: 图表按像素精度渲染,
+        # 传输字节与缓存驻留内存减半
+        cached = {
+            'MACD': macd.astype(np.float32, copy=False),
+            'MACD_signal': signal.astype(np.float32, copy=False),
+            'MACD_hist': histogram.astype(np.float32, copy=False),
+        }
+        store_arrays(key, cached)
 
-    return result
+    if inplace:
+        df['MACD'] = cached['MACD']
+        df['MACD_signal'] = cached['MACD_signal']
+        df['MACD_hist'] = cached['MACD_hist']
+        return df
+    # 三列一次 concat 挂载: 单次构建新 BlockManager,
+    # 避免逐列赋值触发的多轮块整理 (CoW 下原始块直接共享)
+    return pd.concat([df, pd.DataFrame(cached, index=df.index)], axis=1)
 
 
 # ==================== MACD 指标配置 Schema ====================
@@ -77,7 +104,7 @@ MACD_METADATA = IndicatorMetadata(
     description="MACD指标，显示趋势和动量",
     supports_multiple=False,
     display_template="macd",  # 显示DIF和DEA值
-    parameters=[
+    parameters=(
         IndicatorParameter(
             name="fast_period",
             type=ParameterType.NUMBER,
@@ -136,5 +163,5 @@ MACD_METADATA = IndicatorMetadata(
             default="#EF5350",
             description="MACD柱小于0时的颜色"
         )
-    ]
+    )
 )
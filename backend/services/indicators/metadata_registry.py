@@ -3,7 +3,11 @@
 集中管理所有指标的配置Schema
 前端通过API获取这些metadata来自动生成设置面板
 """
+from functools import lru_cache
 from typing import Dict, List, Optional
+
+import orjson
+
 from .base import IndicatorMetadata
 from .moving_average import MA_METADATA
 from .kdj import KDJ_METADATA
@@ -24,6 +28,15 @@ INDICATOR_METADATA_REGISTRY: Dict[str, IndicatorMetadata] = {
     "boll": BOLL_METADATA,
 }
 
+# 注册表运行期不变, 导入时把各种查询视图算好:
+# 全量列表与按分类索引都退化为一次 dict/变量取值
+_ALL_METADATA: List[IndicatorMetadata] = list(INDICATOR_METADATA_REGISTRY.values())
+
+_BY_CATEGORY: Dict[str, List[IndicatorMetadata]] = {}
+for _metadata in _ALL_METADATA:
+    # category 是 str 子类枚举, 与普通字符串同哈希同相等, 可直接作键查询
+    _BY_CATEGORY.setdefault(_metadata.category, []).append(_metadata)
+
 
 # ==================== 工具函数 ====================
 
@@ -45,9 +58,9 @@ def get_all_indicators() -> List[IndicatorMetadata]:
     获取所有指标元数据
 
     Returns:
-        指标元数据列表
+        指标元数据列表 (进程常量, 调用方不应修改)
     """
-    return list(INDICATOR_METADATA_REGISTRY.values())
+    return _ALL_METADATA
 
 
 def get_indicators_by_category(category: str) -> List[IndicatorMetadata]:
@@ -58,13 +71,29 @@ def get_indicators_by_category(category: str) -> List[IndicatorMetadata]:
         category: 指标分类 ('overlay', 'oscillator', 'volume')
 
     Returns:
-        指定分类的指标列表
+        指定分类的指标列表 (O(1) 索引查找)
+    """
+    return _BY_CATEGORY.get(category, [])
+
+
+@lru_cache(maxsize=None)
+def get_indicator_metadata_json(indicator_id: str) -> Optional[bytes]:
+    """
+    获取单个指标元数据的序列化 JSON 字节
+
+    元数据是冻结 dataclass 的进程常量, 每个指标只序列化一次,
+    后续请求直接发送缓存的字节, 不再逐字段遍历
+
+    Args:
+        indicator_id: 指标ID
+
+    Returns:
+        orjson 序列化的 bytes, 指标不存在时为 None
     """
-    return [
-        metadata
-        for metadata in INDICATOR_METADATA_REGISTRY.values()
-        if metadata.category == category
-    ]
+    metadata = INDICATOR_METADATA_REGISTRY.get(indicator_id)
+    if metadata is None:
+        return None
+    return orjson.dumps(metadata)
 
 
 def indicator_exists(indicator_id: str) -> bool:
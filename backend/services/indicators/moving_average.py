@@ -4,8 +4,12 @@
 
 配置Schema：支持多周期同时显示
 """
+import numpy as np
 import pandas as pd
 import talib
+from ._arena import get_scratch
+from ._cache import close_key, get_cached_series, store_series
+from ._kernels import multi_sma_kernel
 from .base import (
     IndicatorMetadata,
     IndicatorParameter,
@@ -14,8 +18,30 @@ from .base import (
     IndicatorCategory
 )
 
+# 长窗口走前缀和差分 (O(N)), 短窗口保留 talib 的滑动和 (O(N·period),
+# 但常数小且与历史输出逐位一致); 阈值以上前缀和在算力和缓存上都占优
+_SMA_CUMSUM_MIN_PERIOD = 32
 
-def calculate_sma(df: pd.DataFrame, period: int) -> pd.DataFrame:
+
+def _sma_cumsum(values: np.ndarray, period: int) -> np.ndarray:
+    """前缀和差分求 SMA: 与窗口长度无关的两遍顺序扫描"""
+    n = len(values)
+    cs = np.empty(n + 1, dtype=np.float64)
+    cs[0] = 0.0
+    np.cumsum(values, out=cs[1:])
+    out = np.full(n, np.nan, dtype=np.float64)
+    if period <= n:
+        out[period - 1:] = (cs[period:] - cs[:-period]) / period
+    return out
+
+
+def calculate_sma(
+    df: pd.DataFrame,
+    period: int,
+    col_name: str | None = None,
+    inplace: bool = False,
+    close: np.ndarray | None = None,
+) -> pd.DataFrame:
     """
     计算简单移动平均线 (Simple Moving Average)
 
@@ -24,6 +50,9 @@ def calculate_sma(df: pd.DataFrame, period: int) -> pd.DataFrame:
     Args:
         df: 包含 'close' 列的 DataFrame
         period: 计算周期（例如：5, 10, 20, 60）
+        col_name: 可选, 自定义输出列名 (默认 'SMA{period}')
+        inplace: True 时直接在 df 上添加列, 不复制 (热路径用, 避免整帧拷贝)
+        close: 可选, 预提取的收盘价数组 (多个指标共享, 省去重复列提取)
 
     Returns:
         添加了 'SMA{period}' 列的 DataFrame
@@ -31,13 +60,84 @@ def calculate_sma(df: pd.DataFrame, period: int) -> pd.DataFrame:
     示例：
         calculate_sma(df, 5)  -> 添加 'SMA5' 列
     """
-    result = df.copy()
-    column_name = f'SMA{period}'
-    result[column_name] = talib.SMA(df['close'].values, timeperiod=period)
+    result = df if inplace else df.copy(deep=False)
+    column_name = col_name or f'SMA{period}'
+    values = close if close is not None else df['close'].values
+    # 按 (内容哈希, 指标, 周期) 缓存: 同一序列重复请求不重跑 TA-Lib
+    key = (close_key(values), 'sma', period)
+    output = get_cached_series(key)
+    if output is None:
+        if period >= _SMA_CUMSUM_MIN_PERIOD:
+            output = _sma_cumsum(np.asarray(values, dtype=np.float64), period)
+        else:
+            output = talib.SMA(values, timeperiod=period)
+        # 计算保持 float64 精度, 出口降为 float32:
+        # 图表按像素精度渲染, 传输字节与缓存驻留内存减半
+        output = output.astype(np.float32, copy=False)
+        store_series(key, output)
+    result[column_name] = output
     return result
 
 
-def calculate_ema(df: pd.DataFrame, period: int) -> pd.DataFrame:
+def calculate_sma_multi(
+    df: pd.DataFrame,
+    periods: list[int],
+    inplace: bool = False,
+    close: np.ndarray | None = None,
+) -> pd.DataFrame:
+    """
+    一次计算多条 SMA (UI 的 MA 面板默认同时要 3 条线)
+
+    未命中缓存的周期批量交给 prange 并行核: 每个周期一个线程,
+    close 只读共享一份, 替代逐周期串行调用的单核执行
+
+    Args:
+        df: 包含 'close' 列的 DataFrame
+        periods: 周期列表 (例如 [5, 20, 60])
+        inplace: True 时直接在 df 上添加列, 不复制
+        close: 可选, 预提取的收盘价数组
+
+    Returns:
+        添加了各 'SMA{period}' 列的 DataFrame
+    """
+    values = close if close is not None else df['close'].values
+    base = close_key(values)
+
+    new_cols = {}
+    missing = []
+    for period in periods:
+        cached = get_cached_series((base, 'sma', period))
+        if cached is not None:
+            new_cols[f'SMA{period}'] = cached
+        else:
+            missing.append(period)
+
+    if missing:
+        contiguous = np.ascontiguousarray(values, dtype=np.float64)
+        # 输出写进池化暂存缓冲, 随即降位拷贝, 不持有缓冲引用
+        out = get_scratch(len(missing), len(contiguous))
+        multi_sma_kernel(contiguous, np.asarray(missing, dtype=np.int64), out)
+        for row, period in enumerate(missing):
+            # 出口降为 float32, 与单周期入口一致 (astype 顺带脱离 out 视图)
+            output = out[row].astype(np.float32)
+            store_series((base, 'sma', period), output)
+            new_cols[f'SMA{period}'] = output
+
+    if inplace:
+        for column, array in new_cols.items():
+            df[column] = array
+        return df
+    # 多列一次 concat 挂载, 避免逐列赋值的多轮块整理
+    return pd.concat([df, pd.DataFrame(new_cols, index=df.index)], axis=1)
+
+
+def calculate_ema(
+    df: pd.DataFrame,
+    period: int,
+    col_name: str | None = None,
+    inplace: bool = False,
+    close: np.ndarray | None = None,
+) -> pd.DataFrame:
     """
     计算指数移动平均线 (Exponential Moving Average)
 
@@ -47,6 +147,9 @@ def calculate_ema(df: pd.DataFrame, period: int) -> pd.DataFrame:
     Args:
         df: 包含 'close' 列的 DataFrame
         period: 计算周期（例如：12, 26）
+        col_name: 可选, 自定义输出列名 (默认 'EMA{period}')
+        inplace: True 时直接在 df 上添加列, 不复制
+        close: 可选, 预提取的收盘价数组
 
     Returns:
         添加了 'EMA{period}' 列的 DataFrame
@@ -54,13 +157,27 @@ def calculate_ema(df: pd.DataFrame, period: int) -> pd.DataFrame:
     说明：
         EMA 对最近价格赋予更高权重，比 SMA 更敏感
     """
-    result = df.copy()
-    column_name = f'EMA{period}'
-    result[column_name] = talib.EMA(df['close'].values, timeperiod=period)
+    result = df if inplace else df.copy(deep=False)
+    column_name = col_name or f'EMA{period}'
+    values = close if close is not None else df['close'].values
+    # 按 (内容哈希, 指标, 周期) 缓存: 同一序列重复请求不重跑 TA-Lib
+    key = (close_key(values), 'ema', period)
+    output = get_cached_series(key)
+    if output is None:
+        # 计算保持 float64, 出口降为 float32 (同 calculate_sma)
+        output = talib.EMA(values, timeperiod=period).astype(np.float32, copy=False)
+        store_series(key, output)
+    result[column_name] = output
     return result
 
 
-def calculate_wma(df: pd.DataFrame, period: int) -> pd.DataFrame:
+def calculate_wma(
+    df: pd.DataFrame,
+    period: int,
+    col_name: str | None = None,
+    inplace: bool = False,
+    close: np.ndarray | None = None,
+) -> pd.DataFrame:
     """
     计算加权移动平均线 (Weighted Moving Average)
 
@@ -69,6 +186,9 @@ def calculate_wma(df: pd.DataFrame, period: int) -> pd.DataFrame:
     Args:
         df: 包含 'close' 列的 DataFrame
         period: 计算周期
+        col_name: 可选, 自定义输出列名 (默认 'WMA{period}')
+        inplace: True 时直接在 df 上添加列, 不复制
+        close: 可选, 预提取的收盘价数组
 
     Returns:
         添加了 'WMA{period}' 列的 DataFrame
@@ -76,9 +196,17 @@ def calculate_wma(df: pd.DataFrame, period: int) -> pd.DataFrame:
     说明：
         WMA 对最近价格赋予线性递增的权重
     """
-    result = df.copy()
-    column_name = f'WMA{period}'
-    result[column_name] = talib.WMA(df['close'].values, timeperiod=period)
+    result = df if inplace else df.copy(deep=False)
+    column_name = col_name or f'WMA{period}'
+    values = close if close is not None else df['close'].values
+    # 按 (内容哈希, 指标, 周期) 缓存: 同一序列重复请求不重跑 TA-Lib
+    key = (close_key(values), 'wma', period)
+    output = get_cached_series(key)
+    if output is None:
+        # 计算保持 float64, 出口降为 float32 (同 calculate_sma)
+        output = talib.WMA(values, timeperiod=period).astype(np.float32, copy=False)
+        store_series(key, output)
+    result[column_name] = output
     return result
 
 
@@ -91,18 +219,18 @@ MA_METADATA = IndicatorMetadata(
     description="移动平均线，支持 SMA/EMA/WMA 类型。",
     supports_multiple=True,
     display_template="ma-multi",
-    parameters=[
+    parameters=(
         # MA Type
         IndicatorParameter(
             name="ma_type",
             type=ParameterType.SELECT,
             label="MA 类型",
             default="sma",
-            options=[
+            options=(
                 ParameterOption(value="sma", label="SMA (简单移动平均)"),
                 ParameterOption(value="ema", label="EMA (指数移动平均)"),
                 ParameterOption(value="wma", label="WMA (加权移动平均)"),
-            ],
+            ),
             description="选择移动平均线的计算方式"
         ),
         # Line 1
@@ -121,7 +249,7 @@ MA_METADATA = IndicatorMetadata(
             type=ParameterType.SELECT,
             label="Line 1 - 颜色",
             default="#2962FF",
-            options=[
+            options=(
                 ParameterOption(value="invisible", label="隐藏 (Invisible)"),
                 ParameterOption(value="#2962FF", label="蓝色"),
                 ParameterOption(value="#FF6B6B", label="红色"),
@@ -130,7 +258,7 @@ MA_METADATA = IndicatorMetadata(
                 ParameterOption(value="#9C27B0", label="紫色"),
                 ParameterOption(value="#4CAF50", label="绿色"),
                 ParameterOption(value="#FFEB3B", label="黄色"),
-            ],
+            ),
             description="第一条MA线的颜色，选择 invisible 隐藏该线"
         ),
         # Line 2
@@ -149,7 +277,7 @@ MA_METADATA = IndicatorMetadata(
             type=ParameterType.SELECT,
             label="Line 2 - 颜色",
             default="#E91E63",
-            options=[
+            options=(
                 ParameterOption(value="invisible", label="隐藏 (Invisible)"),
                 ParameterOption(value="#2962FF", label="蓝色"),
                 ParameterOption(value="#FF6B6B", label="红色"),
@@ -159,7 +287,7 @@ MA_METADATA = IndicatorMetadata(
                 ParameterOption(value="#4CAF50", label="绿色"),
                 ParameterOption(value="#FFEB3B", label="黄色"),
                 ParameterOption(value="#E91E63", label="粉色"),
-            ],
+            ),
             description="第二条MA线的颜色，选择 invisible 隐藏该线"
         ),
         # Line 3
@@ -178,7 +306,7 @@ MA_METADATA = IndicatorMetadata(
             type=ParameterType.SELECT,
             label="Line 3 - 颜色",
             default="#FFA500",
-            options=[
+            options=(
                 ParameterOption(value="invisible", label="隐藏 (Invisible)"),
                 ParameterOption(value="#2962FF", label="蓝色"),
                 ParameterOption(value="#FF6B6B", label="红色"),
@@ -187,8 +315,8 @@ MA_METADATA = IndicatorMetadata(
                 ParameterOption(value="#9C27B0", label="紫色"),
                 ParameterOption(value="#4CAF50", label="绿色"),
                 ParameterOption(value="#FFEB3B", label="黄色"),
-            ],
+            ),
             description="第三条MA线的颜色，选择 invisible 隐藏该线"
         ),
-    ]
+    )
 )
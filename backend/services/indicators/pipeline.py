@@ -0,0 +1,46 @@
+"""
+指标流水线 - 批量应用多个指标, 新列一次性拼接
+
+逐个 `result[col] = ...` 会反复触碰 BlockManager;
+这里把所有新列收集齐后用单次 concat 追加, 原始 OHLCV 块零拷贝共享
+"""
+from typing import Callable, Iterable
+
+import numpy as np
+import pandas as pd
+
+
+def apply_indicators(
+    df: pd.DataFrame,
+    calculators: Iterable[Callable[[pd.DataFrame], pd.DataFrame]],
+) -> pd.DataFrame:
+    """
+    依次应用指标计算函数并批量挂载输出列
+
+    各计算函数在一个 CoW 浅拷贝草稿帧上运行 (可互相读取前序输出列),
+    最终只把新增列转 float32 / NaN 归零后一次 concat 到原帧:
+    单次块追加, 不复制任何原始列
+
+    Args:
+        df: 原始数据
+        calculators: 接收并返回 DataFrame 的指标计算函数序列
+
+    Returns:
+        追加了所有指标列的新 DataFrame (原 df 不被修改)
+    """
+    scratch = df.copy(deep=False)
+    base_columns = set(df.columns)
+    for calculator in calculators:
+        scratch = calculator(scratch)
+
+    new_cols = {}
+    for column in scratch.columns:
+        if column in base_columns:
+            continue
+        array = scratch[column].to_numpy(dtype=np.float32)
+        # 列本身已是 float32 时 to_numpy 返回 CoW 只读视图, 须拷贝后归零
+        new_cols[column] = np.nan_to_num(array, copy=not array.flags.writeable, nan=0.0)
+    if not new_cols:
+        return scratch
+    # CoW 下 concat 本身就是惰性拷贝, 原始块直接共享
+    return pd.concat([df, pd.DataFrame(new_cols, index=df.index)], axis=1)
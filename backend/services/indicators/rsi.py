@@ -4,8 +4,10 @@ RSI 指标 (Relative Strength Index)
 
 配置Schema：单一数值
 """
+import numpy as np
 import pandas as pd
 import talib
+from ._cache import close_key, get_cached_series, store_series
 from .base import (
     IndicatorMetadata,
     IndicatorParameter,
@@ -14,7 +16,12 @@ from .base import (
 )
 
 
-def calculate_rsi(df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
+def calculate_rsi(
+    df: pd.DataFrame,
+    period: int = 14,
+    inplace: bool = False,
+    close: np.ndarray | None = None,
+) -> pd.DataFrame:
     """
     计算 RSI 指标
 
@@ -25,6 +32,8 @@ def calculate_rsi(df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
     Args:
         df: 包含 'close' 列的 DataFrame
         period: 计算周期，默认 14
+        inplace: True 时直接在 df 上添加列, 不复制 (热路径用, 避免整帧拷贝)
+        close: 可选, 预提取的收盘价数组 (多个指标共享, 省去重复列提取)
 
     Returns:
         添加了 'RSI' 列的 DataFrame
@@ -49,8 +58,17 @@ def calculate_rsi(df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
         - 强势市场中，RSI > 70 可以持续很久
         - 弱势市场中，RSI < 30 也可以持续很久
     """
-    result = df.copy()
-    result['RSI'] = talib.RSI(df['close'].values, timeperiod=period)
+    result = df if inplace else df.copy(deep=False)
+    values = close if close is not None else df['close'].values
+    # 按 (内容哈希, 指标, 周期) 缓存: 同一序列重复请求不重跑 TA-Lib
+    key = (close_key(values), 'rsi', period)
+    output = get_cached_series(key)
+    if output is None:
+        # 计算保持 float64 精度, 出口降为 float32:
+        # 图表按像素精度渲染, 传输字节与缓存驻留内存减半
+        output = talib.RSI(values, timeperiod=period).astype(np.float32, copy=False)
+        store_series(key, output)
+    result['RSI'] = output
     return result
 
 
@@ -63,7 +81,7 @@ RSI_METADATA = IndicatorMetadata(
     description="相对强弱指标，判断超买超卖",
     supports_multiple=False,
     display_template="single-value",  # 单一数值显示
-    parameters=[
+    parameters=(
         IndicatorParameter(
             name="period",
             type=ParameterType.NUMBER,
@@ -101,5 +119,5 @@ RSI_METADATA = IndicatorMetadata(
             step=1,
             description="超卖区域阈值"
         )
-    ]
+    )
 )
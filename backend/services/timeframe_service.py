@@ -4,11 +4,84 @@ Timeframe Service - 时间间隔聚合服务
 负责将日线数据聚合为不同时间间隔（周线、月线）的 OHLCV 数据。
 """
 
+import numpy as np
 import pandas as pd
-from typing import Literal
+from collections import OrderedDict
+from typing import Literal, Tuple
+
+from ._timeframe_kernels import segmented_ohlcv
 
 TimeframeType = Literal["daily", "weekly", "monthly"]
 
+# 解析好的 date 列缓存: 用户在周线/月线间切换时同一帧会被连续传入,
+# 字符串解析只做一次 (键用列内容哈希, 与 indicators._cache 的做法一致)
+_DATE_CACHE_MAX_SIZE = 32
+_date_cache: OrderedDict[int, np.ndarray] = OrderedDict()
+
+
+def _parsed_dates(df: pd.DataFrame) -> np.ndarray:
+    """
+    把 df['date'] 解析为 datetime64[D] 数组 (按列内容哈希缓存)
+
+    键必须盖住整列内容: 行数与首末日期相同、但中间停牌日不同的
+    两只股票会在端点键上碰撞, 聚合就会用错月/周边界; 对 U10 日期列
+    做一次 C 级字节哈希仍远快于字符串解析。
+    显式指定 format 跳过 pandas 的格式推断扫描
+    """
+    if len(df) == 0:
+        return np.empty(0, dtype='datetime64[D]')
+    date_col = df['date']
+    cache_key = hash(date_col.to_numpy(dtype='U10').tobytes())
+    dates = _date_cache.get(cache_key)
+    if dates is not None:
+        _date_cache.move_to_end(cache_key)
+        return dates
+    dates = pd.to_datetime(
+        date_col, format='%Y-%m-%d', cache=False
+    ).values.astype('datetime64[D]')
+    _date_cache[cache_key] = dates
+    if len(_date_cache) > _DATE_CACHE_MAX_SIZE:
+        _date_cache.popitem(last=False)
+    return dates
+
+
+def _segment_reduce(df: pd.DataFrame, keys: np.ndarray) -> Tuple[np.ndarray, pd.DataFrame]:
+    """
+    按相邻键变化切段, 用单遍 Numba 核归约出每段的 OHLCV
+
+    数据已按日期排好序, 段边界就是键的跳变点;
+    返回 (各段首行下标, 聚合后的 DataFrame), 首行下标用于取箱标签
+
+    输出按非空段的数量精确分配: 交易空档 (周末/假日/停牌) 不产生段,
+    因此不存在 resample 时代的空箱, 也不需要事后 dropna 的整帧扫描
+    """
+    n = len(df)
+    boundaries = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+    starts = np.empty(boundaries.size + 2, dtype=np.int64)
+    starts[0] = 0
+    starts[1:-1] = boundaries
+    starts[-1] = n
+
+    nseg = starts.size - 1
+    out = np.empty((5, nseg), dtype=np.float64)
+    segmented_ohlcv(
+        df['open'].to_numpy(dtype=np.float64),
+        df['high'].to_numpy(dtype=np.float64),
+        df['low'].to_numpy(dtype=np.float64),
+        df['close'].to_numpy(dtype=np.float64),
+        df['vol'].to_numpy(dtype=np.float64),
+        starts,
+        out[0], out[1], out[2], out[3], out[4],
+    )
+    aggregated = pd.DataFrame({
+        'open': out[0],
+        'high': out[1],
+        'low': out[2],
+        'close': out[3],
+        'vol': out[4],
+    })
+    return starts[:-1], aggregated
+
 
 class TimeframeService:
     """时间间隔聚合服务类"""
@@ -26,11 +99,12 @@ class TimeframeService:
             interval: 时间间隔类型 - 'daily'(日线), 'weekly'(周线), 'monthly'(月线)
 
         Returns:
-            聚合后的 DataFrame
+            聚合后的 DataFrame (调用方不应原地修改; CoW 下真有写入也只会
+            克隆被改的块, 不会波及传入的 df)
         """
         if interval == "daily":
-            # 日线直接返回原数据
-            return df.copy()
+            # 日线无需聚合, 原帧直接返回: 省掉一次整帧 OHLCV 拷贝
+            return df
         elif interval == "weekly":
             return TimeframeService._resample_to_weekly(df)
         elif interval == "monthly":
@@ -49,25 +123,22 @@ class TimeframeService:
         - low: 取一周内最低价
         - close: 取一周最后一个交易日的收盘价
         - vol: 取一周内成交量之和
-        """
-        df = df.copy()
-        df['date'] = pd.to_datetime(df['date'])
-        df = df.set_index('date')
 
-        # 聚合为周线（W-FRI 表示以周五为一周结束）
-        resampled = df.resample('W-FRI').agg({
-            'open': 'first',
-            'high': 'max',
-            'low': 'min',
-            'close': 'last',
-            'vol': 'sum'
-        }).dropna()
+        用整数周键 groupby 而非 resample('W-FRI'):
+        resample 会先铺满含周末/假日空档的完整日历格再丢 NaN 行,
+        groupby 只触碰实际存在的交易日, 无空箱扫描
+        """
+        dates = _parsed_dates(df)
+        days = (dates - np.datetime64('1970-01-01')).astype(np.int64)
+        # 周六起算的周序号, 与 W-FRI (周五收周) 的分箱一致
+        week_key = (days - 2) // 7
 
-        # 重置索引，将日期从索引转回列
-        resampled = resampled.reset_index()
+        seg_first, resampled = _segment_reduce(df, week_key)
 
-        # 保持日期格式为字符串 YYYY-MM-DD
-        resampled['date'] = resampled['date'].dt.strftime('%Y-%m-%d')
+        # 箱标签与 resample 相同: 标到该周的周五 (1970-01-09 是第 0 周的周五)
+        fridays = (week_key[seg_first] * 7 + 8).astype('datetime64[D]')
+        # datetime64[D] 直接转 str 就是 YYYY-MM-DD, 跳过 Python 级 strftime
+        resampled.insert(0, 'date', fridays.astype('U10'))
 
         return resampled
 
@@ -82,25 +153,18 @@ class TimeframeService:
         - low: 取当月内最低价
         - close: 取当月最后一个交易日的收盘价
         - vol: 取当月内成交量之和
+
+        按 datetime64[M] 月键 groupby, 同周线一样绕开 resample 的空箱网格
         """
-        df = df.copy()
-        df['date'] = pd.to_datetime(df['date'])
-        df = df.set_index('date')
-
-        # 聚合为月线（M 表示月末）
-        resampled = df.resample('M').agg({
-            'open': 'first',
-            'high': 'max',
-            'low': 'min',
-            'close': 'last',
-            'vol': 'sum'
-        }).dropna()
-
-        # 重置索引，将日期从索引转回列
-        resampled = resampled.reset_index()
-
-        # 保持日期格式为字符串 YYYY-MM-DD
-        resampled['date'] = resampled['date'].dt.strftime('%Y-%m-%d')
+        dates = _parsed_dates(df)
+        month_key = dates.astype('datetime64[M]').view(np.int64)
+
+        seg_first, resampled = _segment_reduce(df, month_key)
+
+        # 箱标签与 resample('M') 相同: 标到当月最后一个日历日 (+1 月 -1 天)
+        months = month_key[seg_first].astype('datetime64[M]')
+        month_ends = (months + 1).astype('datetime64[D]') - np.timedelta64(1, 'D')
+        resampled.insert(0, 'date', month_ends.astype('U10'))
 
         return resampled
 